@@ -0,0 +1,2 @@
+# Suffixes of grid inputs. Kept here, without numpy, so main.py can check inputs cheaply.
+GRID_FORMATS = [".npy", ".txt", ".sgf"]
@@ -0,0 +1,293 @@
+"""
+Compact on-disk archive of board positions.
+
+Each intersection is stored in 2 bits with the same values as GoAT.logic.encoding.
+All boards in an archive have the same shape so records are fixed-size and
+any range of boards can be memory-mapped without reading the rest of the file.
+
+Layout (little-endian):
+    - File header (16 bytes): magic "GOAT", version (u1), rows (u1),
+      columns (u1, 0 if same as rows), 9 reserved.
+    - Records: captures of black and white stones (2 x u2), source id (u8),
+      packed intersections (ceil(rows * columns / 4) x u1, row-major).
+"""
+
+from __future__ import annotations
+import os
+import pathlib
+import numpy as np
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple, Union
+from loguru import logger
+
+from GoAT.logic.encoding import COLORS, EMPTY, GRID_DTYPE, from_float
+
+MAGIC = b"GOAT"
+VERSION = 1
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "u1"),
+        ("size", "u1"),
+        ("n_cols", "u1"),
+        ("reserved", "V9"),
+    ]
+)
+HEADER_SIZE = HEADER_DTYPE.itemsize
+
+# Bit shift of each of the 4 intersections packed in a byte.
+SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+Batch = Tuple[np.ndarray, np.ndarray, np.ndarray]
+# Board size (square) or (rows, columns).
+Shape = Union[int, Tuple[int, int]]
+
+
+def _as_shape(size: Shape) -> Tuple[int, int]:
+    return (size, size) if isinstance(size, int) else tuple(size)
+
+
+def record_dtype(size: Shape) -> np.dtype:
+    """
+    :return: structured dtype of a single archived board of given size.
+    """
+    n_rows, n_cols = _as_shape(size)
+    n_bytes = -(-n_rows * n_cols // 4)
+    return np.dtype(
+        [
+            ("captures", "<u2", (2,)),
+            ("source_id", "<u8"),
+            ("cells", "u1", (n_bytes,)),
+        ]
+    )
+
+
+def pack_grids(grids: np.ndarray) -> np.ndarray:
+    """
+    Pack grids into 2 bits per intersection.
+
+    :param grids: (N, M, S) int8 grids where 0 is empty, 1 is black and 2 is white.
+        Grids in the legacy float encoding are converted.
+
+    :return: (N, ceil(S * S / 4)) packed bytes.
+    """
+    grids = np.asarray(grids)
+    if np.issubdtype(grids.dtype, np.floating):
+        grids = from_float(grids)
+    # Other values would spill into neighbouring intersections.
+    elif not np.isin(grids, [EMPTY, *COLORS.values()]).all():
+        invalid = set(np.unique(grids).tolist()) - {EMPTY, *COLORS.values()}
+        raise Exception(f"Invalid values in grids: {invalid}")
+    n_grids = grids.shape[0]
+
+    # Pad flattened grids to a multiple of 4 intersections.
+    codes = grids.astype(np.uint8).reshape(n_grids, -1)
+    n_pad = -codes.shape[1] % 4
+    codes = np.pad(codes, ((0, 0), (0, n_pad)))
+
+    return np.bitwise_or.reduce(
+        codes.reshape(n_grids, -1, 4) << SHIFTS, axis=2, dtype=np.uint8
+    )
+
+
+def unpack_grids(packed: np.ndarray, size: Shape) -> np.ndarray:
+    """
+    Unpack 2 bit intersections into grids.
+
+    :param packed: (N, ceil(S * S / 4)) packed bytes.
+    :param size: board size, S, or shape, (M, S).
+
+    :return: (N, M, S) int8 grids where 0 is empty, 1 is black and 2 is white.
+    """
+    n_rows, n_cols = _as_shape(size)
+    n_grids = packed.shape[0]
+    codes = (packed[:, :, None] >> SHIFTS) & 0b11
+    codes = codes.reshape(n_grids, -1)[:, : n_rows * n_cols]
+    return codes.reshape(n_grids, n_rows, n_cols).astype(GRID_DTYPE)
+
+
+class ArchiveWriter:
+    """
+    Append boards to an archive. Creates the archive if it does not exist.
+
+    ex.
+        with ArchiveWriter("boards.goat", size=19) as writer:
+            writer.write(grid, Counter({"Black": 1, "White": 0}), source_id=42)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], size: Shape):
+        """
+        :param size: board size or (rows, columns) of rectangular boards.
+        """
+        self.shape = _as_shape(size)
+        if not all(0 < dim < 256 for dim in self.shape):
+            raise Exception(f"Invalid board size, {size}.")
+
+        self.path = pathlib.Path(path)
+        self.dtype = record_dtype(self.shape)
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            archive_shape = ArchiveReader(self.path).shape
+            if archive_shape != self.shape:
+                raise Exception(
+                    f"Archive, {self.path}, has boards of shape {archive_shape} "
+                    f"not {self.shape}."
+                )
+            self._truncate_partial()
+            self._fh = open(self.path, "ab")
+        else:
+            self._fh = open(self.path, "wb")
+            n_rows, n_cols = self.shape
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header["magic"], header["version"] = MAGIC, VERSION
+            header["size"], header["n_cols"] = n_rows, 0 if n_cols == n_rows else n_cols
+            self._fh.write(header.tobytes())
+
+    def _truncate_partial(self):
+        # A writer that crashed mid-write leaves a partial record that would
+        # misalign every record appended after it.
+        n_bytes = self.path.stat().st_size - HEADER_SIZE
+        n_records = n_bytes // self.dtype.itemsize
+        if n_bytes % self.dtype.itemsize:
+            logger.warning(
+                f"Removing partial record of {n_bytes % self.dtype.itemsize} bytes"
+                f" after {n_records} records in {self.path}."
+            )
+            os.truncate(self.path, HEADER_SIZE + n_records * self.dtype.itemsize)
+
+    def write_batch(
+        self, grids: np.ndarray, captures: np.ndarray, source_ids: np.ndarray
+    ):
+        """
+        :param grids: (N, M, S) grids.
+        :param captures: (N, 2) captured black and white stones. At most 65535.
+        :param source_ids: (N,) non-negative ids of source of each board.
+            ex. image or game id.
+        """
+        grids = np.asarray(grids)
+        if grids.shape[1:] != self.shape:
+            raise Exception(
+                f"Invalid grid shape, {grids.shape[1:]}, for archive of shape {self.shape}."
+            )
+
+        # Out of range values would wrap around when assigned.
+        for name, values in [("captures", captures), ("source_id", source_ids)]:
+            values = np.asarray(values)
+            limits = np.iinfo(self.dtype[name].base)
+            if values.size and (values.min() < limits.min or values.max() > limits.max):
+                raise Exception(
+                    f"Invalid {name}. Must be in [{limits.min}, {limits.max}]."
+                )
+
+        records = np.zeros(grids.shape[0], dtype=self.dtype)
+        records["captures"] = captures
+        records["source_id"] = source_ids
+        records["cells"] = pack_grids(grids)
+        self._fh.write(records.tobytes())
+
+    def write(self, grid: np.ndarray, captures: Counter = None, source_id: int = 0):
+        captures = captures or Counter()
+        self.write_batch(
+            grid[None],
+            np.array([[captures["Black"], captures["White"]]]),
+            np.array([source_id]),
+        )
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class ArchiveReader:
+    """
+    Read boards from an archive with numpy.memmap. Only accessed records are read.
+    """
+
+    path: Union[str, os.PathLike]
+    shape: Tuple[int, int] = field(init=False)
+    records: np.memmap = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.path = pathlib.Path(self.path)
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header["magic"][0] != MAGIC:
+            raise Exception(f"{self.path} is not a board archive.")
+        if header["version"][0] != VERSION:
+            raise Exception(f"Unsupported archive version, {header['version'][0]}.")
+
+        n_rows, n_cols = int(header["size"][0]), int(header["n_cols"][0])
+        self.shape = (n_rows, n_cols or n_rows)
+        dtype = record_dtype(self.shape)
+        n_records = (self.path.stat().st_size - HEADER_SIZE) // dtype.itemsize
+
+        if n_records == 0:
+            self.records = np.zeros(0, dtype=dtype)
+        else:
+            self.records = np.memmap(
+                self.path,
+                dtype=dtype,
+                mode="r",
+                offset=HEADER_SIZE,
+                shape=(n_records,),
+            )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def read(self, start: int = 0, stop: int = None) -> Batch:
+        """
+        Read range of boards.
+
+        :return: (N, M, S) grids, (N, 2) captured black and white stones, (N,) source ids.
+        """
+        records = self.records[start:stop]
+        return (
+            unpack_grids(records["cells"], self.shape),
+            np.array(records["captures"]),
+            np.array(records["source_id"]),
+        )
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, Counter, int]:
+        """
+        :return: grid, captures and source id of a single board.
+        """
+        record = self.records[idx]
+        grid = unpack_grids(record["cells"][None], self.shape)[0]
+        n_black, n_white = (int(n) for n in record["captures"])
+        return (
+            grid,
+            Counter({"Black": n_black, "White": n_white}),
+            int(record["source_id"]),
+        )
+
+    def batches(
+        self, batch_size: int = 1024, start: int = 0, stop: int = None
+    ) -> Iterator[Batch]:
+        """
+        Iterate over boards in batches. Only one batch is unpacked in memory at a time.
+
+        :param start: first board. Use with stop to split an archive across processes.
+        :param stop: board to stop before. Defaults to end of archive.
+
+        :return: generator of batches. See read.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for batch_start in range(start, stop, batch_size):
+            yield self.read(batch_start, min(batch_start + batch_size, stop))
+
+    def partition(self, n_parts: int) -> List[Tuple[int, int]]:
+        """
+        Split archive into contiguous, near equal ranges of boards.
+
+        :return: (start, stop) of each part.
+        """
+        bounds = np.linspace(0, len(self), n_parts + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds, bounds[1:])]
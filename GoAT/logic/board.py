@@ -1,28 +1,40 @@
 from __future__ import annotations
 import collections
 import textwrap
+import bidict
 import numpy as np
-import igraph
 
-from typing import Set, Tuple, List, Dict, Iterable
+from typing import Set, Tuple, List, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 from itertools import product
 from collections import Counter
 from loguru import logger
 
+from GoAT.metrics import Metrics, NULL_METRICS
+from GoAT.logic.encoding import COLORS, EMPTY, from_float
+
+if TYPE_CHECKING:
+    import igraph
+
 
 @dataclass
 class Region:
     id_num: int = field(init=False, default=0)
     grid: np.ndarray = field(repr=False)
     pieces: Set[Tuple[int, int]]
-    color_val: str = field(init=False)
+    color_val: int = field(init=False)
     is_seki: bool = field(init=False, default=False)
+    # Stones that can never be captured. See Board._update_life.
+    is_alive: bool = field(init=False, default=False)
+    # Stones inside opponent's proven territory.
+    is_proven_dead: bool = field(init=False, default=False)
+    # Color value of player that empty region is proven territory of.
+    safe_owner: Optional[int] = field(init=False, default=None)
 
     def __post_init__(self):
         # Get random piece in region to determine color value.
         random_piece = next(iter(self.pieces))
-        self.color_val = self.grid[random_piece[0], random_piece[1]]
+        self.color_val = int(self.grid[random_piece[0], random_piece[1]])
 
     def get_adj_pieces(self, piece: Tuple[int, int]) -> Iterable[Tuple[int, int]]:
         (row, col) = piece
@@ -50,7 +62,7 @@ class Region:
         all_liberties = set()
         for adj_piece in self.adjacencies:
             adj_row, adj_col = adj_piece
-            if np.isnan(self.grid[adj_row, adj_col]):
+            if self.grid[adj_row, adj_col] == EMPTY:
                 all_liberties.add(adj_piece)
 
         return all_liberties
@@ -59,12 +71,7 @@ class Region:
     def n_adj_pieces(self) -> collections.Counter:
         adj_pieces = Counter()
         for adj_piece in self.adjacencies:
-            adj_piece_type = self.grid[adj_piece[0], adj_piece[1]]
-            if np.isnan(adj_piece_type):
-                # Do not use NaN as a dict key as NaN not equal to itself.
-                adj_pieces["nan"] += 1
-            else:
-                adj_pieces[adj_piece_type] += 1
+            adj_pieces[int(self.grid[adj_piece[0], adj_piece[1]])] += 1
 
         return adj_pieces
 
@@ -77,7 +84,7 @@ class Region:
 
     @property
     def is_dame(self) -> bool:
-        if np.isnan(self.color_val) and len(self.n_adj_pieces.keys()) > 1:
+        if self.color_val == EMPTY and len(self.n_adj_pieces.keys()) > 1:
             return True
 
     @property
@@ -107,7 +114,7 @@ class Region:
             Region of {len(self.pieces)} pieces of {self.color_val}.
             Number of liberties: {len(self.liberties)}
             Pieces: {self.pieces}
-            Seki: {self.is_seki if np.isnan(self.color_val) else "N/A"}
+            Seki: {self.is_seki if self.color_val == EMPTY else "N/A"}
             On border: {self.is_on_border}
             Number adjacencies: {self.n_adj_pieces}
         """
@@ -117,25 +124,33 @@ class Region:
 @dataclass
 class Board:
     grid: np.ndarray
-    colors: Dict[str, float]
+    colors: Dict[str, int]
     captures: Counter[str, int]
     regions: List[Region] = field(init=False)
-    graph: igraph.Graph = field(init=False)
+    region_edges: List[Tuple[int, int]] = field(init=False, repr=False)
+    # Points that each player is proven to own, including opponent stones that
+    # clear_dead_regions removes.
+    safe_territory: Dict[str, Set[Tuple[int, int]]] = field(init=False, repr=False)
+    metrics: Metrics = field(default=NULL_METRICS, repr=False, compare=False)
 
     def validate_fields(self):
-        x, y = self.grid.shape
-        if x != y:
-            raise Exception(f"Invalid grid shape. x:{x} =/= y: {y}")
+        if self.grid.ndim != 2 or self.grid.size == 0:
+            raise Exception(f"Invalid grid shape. {self.grid.shape}")
         if "Black" not in self.colors or "White" not in self.colors:
             raise Exception(f"Invalid colors in provided colors: {self.colors.keys()}")
         if self.colors.keys() != self.captures.keys():
             raise Exception(f"Invalid colors in captures: ({self.captures}).")
-        if not all(isinstance(piece_val, float) for piece_val in self.colors.values()):
-            raise Exception(
-                f"Pieces must have an associated float value. {self.colors.values()}"
-            )
+        if dict(self.colors) != COLORS:
+            raise Exception(f"Pieces must have values {COLORS}. {dict(self.colors)}")
 
     def __post_init__(self):
+        # Convert legacy float grid where NaN is empty.
+        if np.issubdtype(self.grid.dtype, np.floating):
+            self.grid = from_float(
+                self.grid, self.colors["Black"], self.colors["White"]
+            )
+            self.colors = bidict.bidict(COLORS)
+
         self.validate_fields()
 
         logger.info(f"Pieces: {self.colors}")
@@ -144,7 +159,16 @@ class Board:
         # self._update_seki()
 
     def _update(self):
-        self._get_regions()._join_nearby_regions()._update_graph()
+        with self.metrics.timer("_get_regions"):
+            self._get_regions()
+        # Before joining so each region of stones is a single chain.
+        with self.metrics.timer("_update_life"):
+            self._update_life()
+        with self.metrics.timer("_join_nearby_regions"):
+            self._join_nearby_regions()
+        with self.metrics.timer("_update_graph"):
+            self._update_graph()
+        self.metrics.gauge("regions", len(self.regions))
 
     @property
     def n_rows(self) -> int:
@@ -157,11 +181,11 @@ class Board:
     @property
     def dead_regions(self) -> Iterable[Region]:
         for region in self.regions:
-            # Skip empty regions.
-            if np.isnan(region.color_val):
+            # Skip empty regions and stones that can never be captured.
+            if region.color_val == EMPTY or region.is_alive:
                 continue
 
-            if region.is_dead:
+            if region.is_dead or region.is_proven_dead:
                 yield region
 
     @property
@@ -174,11 +198,7 @@ class Board:
 
     @property
     def region_counts(self) -> Counter:
-        # Avoid nan as key.
-        return Counter(
-            "nan" if np.isnan(region.color_val) else region.color_val
-            for region in self.regions
-        )
+        return Counter(region.color_val for region in self.regions)
 
     def _update_seki(self) -> Board:
         n_dead_regions = len(list(self.dead_regions))
@@ -186,8 +206,12 @@ class Board:
         updated_regions = []
         for region in self.regions:
 
-            # If empty and has both players adjacent.
-            if np.isnan(region.color_val) and len(region.n_adj_pieces) == 2:
+            # If empty, has both players adjacent and isn't proven territory.
+            if (
+                region.color_val == EMPTY
+                and region.safe_owner is None
+                and len(region.n_adj_pieces) == 2
+            ):
                 for piece in region:
                     if region.is_seki:
                         break
@@ -203,7 +227,7 @@ class Board:
                         new_dead_regions.append(len(list(self.dead_regions)))
 
                         # Reset to original state.
-                        self.grid[row, col] = np.nan
+                        self.grid[row, col] = EMPTY
                         self._update()
 
                     # If number of dead regions for both changes, is seki.
@@ -219,8 +243,14 @@ class Board:
         return self
 
     def clear_dead_regions(self) -> Board:
+        with self.metrics.timer("clear_dead_regions"):
+            return self._clear_dead_regions()
+
+    def _clear_dead_regions(self) -> Board:
         logger.info("Clearing dead regions from board.")
         for region in self.dead_regions:
+            self.metrics.count("dead_groups")
+            self.metrics.count("dead_pieces", len(region))
             region_color = self.colors.inverse[region.color_val]
             for i, piece in enumerate(region, 1):
                 (row, col) = piece
@@ -228,7 +258,7 @@ class Board:
                 # Update captured pieces.
                 self.captures[region_color] += 1
 
-                self.grid[row, col] = np.nan
+                self.grid[row, col] = EMPTY
             logger.info(f"Removed {i} {region_color} pieces from board.\n{region}")
 
         # Update regions.
@@ -241,52 +271,50 @@ class Board:
 
         return self
 
-    def _cluster_pieces(self, loc: Tuple[int, int]) -> Iterable[Tuple[int, int]]:
-        row, col = loc
-
-        yield loc
-        curr_piece = self.grid[row, col]
-        if not col + 1 == self.n_cols:
-            adj_piece = self.grid[row, col + 1]
-            # Check adjacent pieces are equivalent. Then keep going to next col.
-            if np.array_equal(curr_piece, adj_piece) or (
-                np.isnan(curr_piece) & np.isnan(adj_piece)
-            ):
-                yield from self._cluster_pieces((row, col + 1))
-        if not row + 1 == self.n_rows:
-            adj_piece = self.grid[row + 1, col]
-            if np.array_equal(curr_piece, adj_piece) or (
-                np.isnan(curr_piece) & np.isnan(adj_piece)
-            ):
-                yield from self._cluster_pieces((row + 1, col))
+    def _cluster_pieces(self, loc: Tuple[int, int]) -> Set[Tuple[int, int]]:
+        """
+        Get connected pieces of the same value as loc with an iterative flood fill.
+        """
+        curr_piece = self.grid[loc]
+        cluster = {loc}
+        stack = [loc]
+        while stack:
+            row, col = stack.pop()
+            for adj_row, adj_col in [
+                (row + 1, col),
+                (row - 1, col),
+                (row, col + 1),
+                (row, col - 1),
+            ]:
+                if not (0 <= adj_row < self.n_rows and 0 <= adj_col < self.n_cols):
+                    continue
+                # Check adjacent pieces are equivalent. Then keep going from it.
+                adj_piece = (adj_row, adj_col)
+                if adj_piece not in cluster and self.grid[adj_piece] == curr_piece:
+                    cluster.add(adj_piece)
+                    stack.append(adj_piece)
+        return cluster
 
     @property
     def region_nums(self):
         return [region.id_num for region in self.regions]
 
     def _get_regions(self) -> Board:
-        region_num = 1
         regions = []
-        # Produce all separate regions by iterating through all pieces on board.
-        # Then condensing intersecting regions.
+        visited = np.zeros(self.grid.shape, dtype=bool)
+        # Flood fill from each piece not already in a region. Each piece is visited once.
         for pair in product(range(self.n_rows), range(self.n_cols)):
-            subregion = {cluster for cluster in self._cluster_pieces(pair)}
+            if visited[pair]:
+                continue
 
-            for i, region in enumerate(regions):
-                # Group regions that have connected pieces.
-                region_pieces = set(region.pieces)
-                if len(region_pieces.intersection(subregion)) > 0:
-                    subregion = region_pieces.union(subregion)
-                    # Remove subregions that make up larger regions
-                    regions.pop(i)
+            subregion = self._cluster_pieces(pair)
+            for piece in subregion:
+                visited[piece] = True
 
             # Init subregion as Region obj.
-            subregion = Region(self.grid, set(subregion))
-
-            if subregion not in regions:
-                subregion.id_num = region_num
-                regions.append(subregion)
-                region_num += 1
+            subregion = Region(self.grid, subregion)
+            subregion.id_num = len(regions) + 1
+            regions.append(subregion)
 
         self.regions = regions
         logger.debug(f"Detected {len(self.regions)} total regions.")
@@ -294,73 +322,252 @@ class Board:
 
     def _join_nearby_regions(self) -> Board:
         """
-        Join regions with at least one shared liberty.
+        Join regions of the same color with at least one shared liberty.
+        Regions sharing liberties through other regions are joined together.
 
         :return self: Board instance
         """
-        removed_regions = []
-        joined_regions = []
         new_region_num = max(self.region_nums) + 1
 
-        for n, region in enumerate(self.regions):
-            for n2, region2 in enumerate(self.regions):
-                # Ignore same region
-                if n == n2:
-                    continue
+        # Union-find of regions by index. Regions are joined through their liberties.
+        parents = list(range(len(self.regions)))
 
-                shared_liberties = region.liberties.intersection(region2.liberties)
+        def find(idx: int) -> int:
+            while parents[idx] != idx:
+                parents[idx] = parents[parents[idx]]
+                idx = parents[idx]
+            return idx
 
-                # If share liberty, join regions.
-                if len(shared_liberties) != 0:
-                    if region.color_val == region2.color_val:
-                        # Use set to ensure no duplicates are created.
-                        merged_pieces = region.pieces.union(region2.pieces)
-                        joined_region = Region(self.grid, set(merged_pieces))
-
-                        joined_region.id_num = new_region_num
-                        new_region_num += 1
+        liberty_regions: Dict[Tuple[int, Tuple[int, int]], int] = {}
+        for idx, region in enumerate(self.regions):
+            if region.color_val == EMPTY:
+                continue
+            for liberty in region.liberties:
+                key = (region.color_val, liberty)
+                if key in liberty_regions:
+                    parents[find(idx)] = find(liberty_regions[key])
+                else:
+                    liberty_regions[key] = idx
 
-                        if region not in removed_regions:
-                            removed_regions.append(region)
-                        if region2 not in removed_regions:
-                            removed_regions.append(region2)
-                        if joined_region not in joined_regions:
-                            joined_regions.append(joined_region)
+        groups: Dict[int, List[Region]] = collections.defaultdict(list)
+        for idx, region in enumerate(self.regions):
+            groups[find(idx)].append(region)
 
         # Number removed and number joined.
         n_r, n_j = 0, 0
-        for n_r, removed_region in enumerate(removed_regions, 1):
-            logger.debug(f"Joining regions. Removing:\n{removed_region}")
-            self.regions.remove(removed_region)
-        for n_j, new_region in enumerate(joined_regions, 1):
-            logger.debug(f"Joining regions. Adding:\n{new_region}")
-            self.regions.append(new_region)
+        regions = []
+        joined_regions = []
+        for group in groups.values():
+            if len(group) == 1:
+                regions.extend(group)
+                continue
+
+            for removed_region in group:
+                n_r += 1
+                logger.debug(f"Joining regions. Removing:\n{removed_region}")
+
+            merged_pieces = set().union(*(region.pieces for region in group))
+            joined_region = Region(self.grid, merged_pieces)
+            joined_region.id_num = new_region_num
+            joined_region.is_alive = all(region.is_alive for region in group)
+            joined_region.is_proven_dead = all(
+                region.is_proven_dead for region in group
+            )
+            new_region_num += 1
+
+            n_j += 1
+            logger.debug(f"Joining regions. Adding:\n{joined_region}")
+            joined_regions.append(joined_region)
+
+        self.regions = regions + joined_regions
 
+        self.metrics.count("joins", n_j)
         logger.debug("Finished joining regions.")
         logger.debug(f"Removed intermediate regions: {n_r}")
         logger.debug(f"Added joined regions: {n_j}")
         return self
 
-    def _update_graph(self) -> Board:
-        adj_regions = []
-        for n, region in enumerate(self.regions):
-            for n2, region2 in enumerate(self.regions):
-                # Ignore same region
-                if n == n2:
-                    continue
+    def _label_regions(self) -> np.ndarray:
+        """
+        :return: grid of region id of each piece.
+        """
+        labels = np.zeros(self.grid.shape, dtype=int)
+        for region in self.regions:
+            for piece in region.pieces:
+                labels[piece] = region.id_num
+        return labels
+
+    @staticmethod
+    def _adjacent_regions(labels: np.ndarray) -> Set[Tuple[int, int]]:
+        """
+        :return: pairs of ids of adjacent regions in both directions.
+        """
+        # Adjacent pieces with different labels connect their regions.
+        adj_regions = set()
+        for region_1, region_2 in [
+            (labels[:, :-1], labels[:, 1:]),
+            (labels[:-1, :], labels[1:, :]),
+        ]:
+            is_adj = region_1 != region_2
+            for id_1, id_2 in zip(region_1[is_adj].tolist(), region_2[is_adj].tolist()):
+                adj_regions.add((id_1, id_2))
+                adj_regions.add((id_2, id_1))
+        return adj_regions
+
+    def _update_life(self) -> Board:
+        """
+        Find chains that can never be captured and the territory they prove with
+        Benson's algorithm. Runs on unjoined regions.
+        Source:
+            - https://senseis.xmp.net/?BensonsAlgorithm
+
+        :return self: Board instance
+        """
+        labels = self._label_regions()
+        regions = {region.id_num: region for region in self.regions}
+        neighbors: Dict[int, Set[int]] = collections.defaultdict(set)
+        for id_1, id_2 in self._adjacent_regions(labels):
+            neighbors[id_1].add(id_2)
+
+        self.safe_territory = {}
+        for color, color_val in self.colors.items():
+            alive, territory = self._benson(color_val, regions, neighbors, labels)
+            for id_num in alive:
+                regions[id_num].is_alive = True
+
+            self.safe_territory[color] = set()
+            for id_num in territory:
+                region = regions[id_num]
+                if region.color_val == EMPTY:
+                    region.safe_owner = color_val
+                else:
+                    region.is_proven_dead = True
+                self.safe_territory[color].update(region.pieces)
+
+        self.metrics.gauge("alive_chains", sum(r.is_alive for r in self.regions))
+        return self
 
-                adj_pieces = region.pieces.intersection(region2.adjacencies)
+    def _benson(
+        self,
+        color_val: int,
+        regions: Dict[int, Region],
+        neighbors: Dict[int, Set[int]],
+        labels: np.ndarray,
+    ) -> Tuple[Set[int], Set[int]]:
+        """
+        Benson's algorithm for a single player.
+
+        Chains are removed until each remaining chain has at least two vital regions.
+        A region is vital to a chain if every empty point in it is a liberty of the
+        chain. Enclosed regions bordering a removed chain are removed with it.
 
-                # If adjacent pieces
-                if len(adj_pieces) != 0:
-                    adj_regions.append((region.id_num, region2.id_num))
+        :param color_val: value of player's pieces.
+        :param regions: unjoined regions by id.
+        :param neighbors: ids of adjacent regions by region id.
+        :param labels: grid of region id of each piece.
+
+        :return: ids of unconditionally alive chains.
+        :return: ids of empty and opponent regions that are proven territory.
+        """
+
+        def empty_points(
+            members: List[int],
+        ) -> Iterator[Tuple[Region, Tuple[int, int]]]:
+            for id_num in members:
+                if regions[id_num].color_val == EMPTY:
+                    for piece in regions[id_num]:
+                        yield regions[id_num], piece
+
+        # Regions enclosed by player. Connected empty and opponent regions.
+        enclosed: List[List[int]] = []
+        visited: Set[int] = set()
+        for id_num, region in regions.items():
+            if region.color_val == color_val or id_num in visited:
+                continue
+            members = []
+            stack = [id_num]
+            visited.add(id_num)
+            while stack:
+                curr_id = stack.pop()
+                members.append(curr_id)
+                for adj_id in neighbors[curr_id]:
+                    if adj_id not in visited and regions[adj_id].color_val != color_val:
+                        visited.add(adj_id)
+                        stack.append(adj_id)
+            enclosed.append(members)
+
+        vital: List[Set[int]] = []
+        bordered: Dict[int, List[int]] = collections.defaultdict(list)
+        n_vital = Counter()
+        for idx, members in enumerate(enclosed):
+            for chain_id in {
+                adj_id
+                for id_num in members
+                for adj_id in neighbors[id_num]
+                if regions[adj_id].color_val == color_val
+            }:
+                bordered[chain_id].append(idx)
+
+            # Chains adjacent to every empty point. Never vital if there are none.
+            vital_chains = None
+            for region, piece in empty_points(members):
+                adj_chains = {
+                    int(labels[adj_piece])
+                    for adj_piece in region.get_adj_pieces(piece)
+                    if self.grid[adj_piece] == color_val
+                }
+                vital_chains = (
+                    adj_chains if vital_chains is None else vital_chains & adj_chains
+                )
+                if not vital_chains:
+                    break
+            vital.append(vital_chains or set())
+            n_vital.update(vital[-1])
+
+        alive = {id_num for id_num, r in regions.items() if r.color_val == color_val}
+        remaining = set(range(len(enclosed)))
+        removed = [id_num for id_num in alive if n_vital[id_num] < 2]
+        while removed:
+            chain_id = removed.pop()
+            if chain_id not in alive:
+                continue
+            alive.remove(chain_id)
+            for idx in bordered[chain_id]:
+                if idx not in remaining:
+                    continue
+                remaining.remove(idx)
+                for vital_id in vital[idx]:
+                    n_vital[vital_id] -= 1
+                    if n_vital[vital_id] < 2:
+                        removed.append(vital_id)
+
+        # Remaining regions only border alive chains. Opponent can't live in them if
+        # every empty point is a liberty of one of them.
+        territory = {
+            id_num for idx in remaining if vital[idx] for id_num in enclosed[idx]
+        }
+        return alive, territory
 
-        # Generate graph
-        self.graph = igraph.Graph(adj_regions)
+    def _update_graph(self) -> Board:
+        self.region_edges = sorted(self._adjacent_regions(self._label_regions()))
+        self._graph = None
         return self
 
+    @property
+    def graph(self) -> igraph.Graph:
+        """
+        Graph of adjacent regions by region id. Built on first access.
+        """
+        if self._graph is None:
+            # igraph is slow to import and not needed for scoring.
+            import igraph
+
+            self._graph = igraph.Graph(self.region_edges)
+        return self._graph
+
     def view_regions(self):
-        grid_view = self.grid.copy()
+        # Region ids can exceed int8.
+        grid_view = self.grid.astype(int)
         for region in self.regions:
             for piece in region.pieces:
                 row, col = piece
@@ -0,0 +1,62 @@
+"""
+Board encoding shared by the vision loader, grid formats, Board and Score.
+
+Grids are int8 matrices where 0 is empty, 1 is black and 2 is white.
+The legacy float encoding (1.0 is black, 0.0 is white and NaN is empty) can be
+converted with from_float and to_float.
+"""
+
+import numpy as np
+
+from typing import Dict
+
+GRID_DTYPE = np.int8
+EMPTY, BLACK, WHITE = 0, 1, 2
+COLORS: Dict[str, int] = {"Black": BLACK, "White": WHITE}
+
+LEGACY_BLACK, LEGACY_WHITE = 1.0, 0.0
+
+
+def empty_grid(n_rows: int, n_cols: int) -> np.ndarray:
+    return np.full((n_rows, n_cols), EMPTY, dtype=GRID_DTYPE)
+
+
+def from_float(
+    grid: np.ndarray, black: float = LEGACY_BLACK, white: float = LEGACY_WHITE
+) -> np.ndarray:
+    """
+    Convert grid in legacy float encoding.
+
+    :param grid: goban as matrix where NaN is empty.
+    :param black: value of black pieces.
+    :param white: value of white pieces.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    grid = np.asarray(grid, dtype=float)
+    values = grid[~np.isnan(grid)]
+    if not np.isin(values, [black, white]).all():
+        raise Exception(f"Invalid values in grid: {set(values) - {black, white}}")
+
+    encoded = np.full(grid.shape, EMPTY, dtype=GRID_DTYPE)
+    encoded[grid == black] = BLACK
+    encoded[grid == white] = WHITE
+    return encoded
+
+
+def to_float(
+    grid: np.ndarray, black: float = LEGACY_BLACK, white: float = LEGACY_WHITE
+) -> np.ndarray:
+    """
+    Convert grid to legacy float encoding.
+
+    :param grid: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    :param black: value of black pieces.
+    :param white: value of white pieces.
+
+    :return: goban as matrix where NaN is empty.
+    """
+    decoded = np.full(grid.shape, np.nan)
+    decoded[grid == BLACK] = black
+    decoded[grid == WHITE] = white
+    return decoded
@@ -0,0 +1,284 @@
+"""
+Read board positions from non-image inputs. Only depends on numpy so the
+vision stack (OpenCV) is never imported for these inputs.
+
+Supported formats:
+    - .npy: int8 grid array where 0 is empty, 1 is black and 2 is white.
+      Legacy float grids where 1.0 is black, 0.0 is white and NaN is empty are converted.
+    - .txt: text diagram. See parse_diagram.
+    - .sgf: final position of the main line of a game record. See parse_sgf.
+"""
+
+from __future__ import annotations
+import pathlib
+import string
+import numpy as np
+
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple, Union
+
+from GoAT.logic import GRID_FORMATS
+from GoAT.logic.encoding import BLACK, EMPTY, GRID_DTYPE, WHITE, empty_grid, from_float
+
+# SGF point coordinates in order.
+SGF_COORDS = string.ascii_lowercase + string.ascii_uppercase
+
+DIAGRAM_SYMBOLS = {
+    "X": BLACK,
+    "B": BLACK,
+    "#": BLACK,
+    "O": WHITE,
+    "W": WHITE,
+    ".": EMPTY,
+    "+": EMPTY,
+    "-": EMPTY,
+}
+
+
+def _empty_captures() -> Counter:
+    return Counter({"Black": 0, "White": 0})
+
+
+def load_npy(path: Union[str, pathlib.Path]) -> np.ndarray:
+    """
+    Load grid saved with np.save.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    grid = np.load(path, allow_pickle=False)
+    if grid.ndim != 2:
+        raise Exception(f"Grid must be 2D. Got shape {grid.shape}.")
+
+    if np.issubdtype(grid.dtype, np.floating):
+        return from_float(grid)
+    if not np.isin(grid, [EMPTY, BLACK, WHITE]).all():
+        raise Exception(
+            f"Invalid values in grid: {set(grid.flat) - {EMPTY, BLACK, WHITE}}"
+        )
+    return grid.astype(GRID_DTYPE)
+
+
+def parse_diagram(text: str) -> np.ndarray:
+    """
+    Parse compact text diagram of a goban.
+
+    Rows are separated by newlines or "/". Spaces are ignored.
+    Black is "X", "B" or "#". White is "O" or "W". Empty is ".", "+" or "-".
+
+    ex. "XO./.XO/..X"
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    rows = []
+    for line in text.replace("/", "\n").splitlines():
+        line = "".join(line.split()).upper()
+        if not line:
+            continue
+        try:
+            rows.append([DIAGRAM_SYMBOLS[symbol] for symbol in line])
+        except KeyError as err:
+            raise Exception(f"Invalid symbol in diagram: {err}")
+
+    if not rows or any(len(row) != len(rows[0]) for row in rows):
+        raise Exception("Diagram rows must be non-empty and of equal length.")
+
+    return np.array(rows, dtype=GRID_DTYPE)
+
+
+def _tokenize_sgf(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    Tokenize SGF into ("(" | ")" | ";", "") and ("ident" | "value", text) tokens.
+    """
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if char in "();":
+            yield char, ""
+            i += 1
+        elif char == "[":
+            # Value ends at first unescaped "]".
+            value = []
+            i += 1
+            while i < n and text[i] != "]":
+                if text[i] == "\\":
+                    i += 1
+                    if i == n:
+                        break
+                value.append(text[i])
+                i += 1
+            if i >= n:
+                raise Exception("Invalid SGF. Property value is not terminated.")
+            yield "value", "".join(value)
+            i += 1
+        elif char.isalpha():
+            start = i
+            while i < n and text[i].isalpha():
+                i += 1
+            yield "ident", text[start:i]
+        else:
+            i += 1
+
+
+def _sgf_main_line(text: str) -> List[Dict[str, List[str]]]:
+    """
+    Get nodes of main line (first variation at each branch) of first game in SGF.
+
+    Variations always follow a node sequence so the main line is every node
+    before the first closing parenthesis.
+
+    :return: nodes as dict of property identifiers to values.
+    """
+    nodes = []
+    ident = None
+    for token, value in _tokenize_sgf(text):
+        if token == ")":
+            break
+        elif token == ";":
+            nodes.append({})
+            ident = None
+        elif token == "ident" and nodes:
+            ident = value.upper()
+            nodes[-1].setdefault(ident, [])
+        elif token == "value" and ident is not None:
+            nodes[-1][ident].append(value)
+
+    if not nodes:
+        raise Exception("No game found in SGF.")
+    return nodes
+
+
+def _sgf_points(values: List[str], shape: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    """
+    Convert SGF point values to (row, col). Compressed lists (ex. "aa:cc") are expanded.
+    """
+    for value in values:
+        if ":" in value:
+            start, end = value.split(":")
+            (row_1, col_1), (row_2, col_2) = (
+                _sgf_point(start, shape),
+                _sgf_point(end, shape),
+            )
+            for row in range(min(row_1, row_2), max(row_1, row_2) + 1):
+                for col in range(min(col_1, col_2), max(col_1, col_2) + 1):
+                    yield row, col
+            continue
+
+        # Empty value or "tt" on boards up to 19x19 is a pass.
+        if value == "" or (value == "tt" and max(shape) <= 19):
+            continue
+        yield _sgf_point(value, shape)
+
+
+def _sgf_point(value: str, shape: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Convert SGF point (ex. "dp" as column d, row p) to (row, col).
+    Coordinates past "z" continue from "A" to "Z" for boards up to 52 x 52.
+    """
+    if len(value) != 2 or not all(char in SGF_COORDS for char in value):
+        raise Exception(f"Invalid SGF point, {value}.")
+    col, row = SGF_COORDS.index(value[0]), SGF_COORDS.index(value[1])
+    if not (0 <= row < shape[0] and 0 <= col < shape[1]):
+        raise Exception(f"SGF point, {value}, out of bounds.")
+    return row, col
+
+
+def _group(grid: np.ndarray, loc: Tuple[int, int]) -> Tuple[set, bool]:
+    """
+    Get stones connected to loc and whether the group has any liberties.
+    """
+    color = grid[loc]
+    n_rows, n_cols = grid.shape
+    group = {loc}
+    stack = [loc]
+    has_liberty = False
+    while stack:
+        row, col = stack.pop()
+        for adj in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]:
+            if not (0 <= adj[0] < n_rows and 0 <= adj[1] < n_cols):
+                continue
+            if grid[adj] == EMPTY:
+                has_liberty = True
+            elif grid[adj] == color and adj not in group:
+                group.add(adj)
+                stack.append(adj)
+    return group, has_liberty
+
+
+def _play(grid: np.ndarray, loc: Tuple[int, int], color: int) -> int:
+    """
+    Place stone and remove captured opposing groups.
+
+    :return: number of captured stones.
+    """
+    grid[loc] = color
+    row, col = loc
+    n_captured = 0
+    for adj in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]:
+        if not (0 <= adj[0] < grid.shape[0] and 0 <= adj[1] < grid.shape[1]):
+            continue
+        if grid[adj] == EMPTY or grid[adj] == color:
+            continue
+        group, has_liberty = _group(grid, adj)
+        if not has_liberty:
+            for stone in group:
+                grid[stone] = EMPTY
+            n_captured += len(group)
+    return n_captured
+
+
+def parse_sgf(text: str) -> Tuple[np.ndarray, Counter]:
+    """
+    Get final position of the main line of a SGF game record.
+
+    Setup stones (AB, AW, AE) are placed and moves (B, W) are played with captures.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    :return: captured pieces by color. ex. {"Black": black stones captured by white}
+    """
+    nodes = _sgf_main_line(text)
+    size = nodes[0].get("SZ", ["19"])[0]
+    try:
+        # Rectangular boards are given as SZ[columns:rows].
+        if ":" in size:
+            n_cols, n_rows = (int(dim) for dim in size.split(":"))
+        else:
+            n_cols = n_rows = int(size)
+    except ValueError:
+        raise Exception(f"Invalid board size, SZ[{size}].")
+
+    shape = (n_rows, n_cols)
+    grid = empty_grid(n_rows, n_cols)
+    captures = _empty_captures()
+    for node in nodes:
+        for prop, color in [("AB", BLACK), ("AW", WHITE), ("AE", EMPTY)]:
+            for loc in _sgf_points(node.get(prop, []), shape):
+                grid[loc] = color
+        for prop, color, opponent in [("B", BLACK, "White"), ("W", WHITE, "Black")]:
+            for loc in _sgf_points(node.get(prop, []), shape):
+                captures[opponent] += _play(grid, loc, color)
+
+    return grid, captures
+
+
+def load_grid(path: Union[str, pathlib.Path]) -> Tuple[np.ndarray, Counter]:
+    """
+    Load board position from a non-image file based on its extension.
+
+    :param path: .npy, .txt (diagram) or .sgf file.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    :return: captured pieces by color recorded in file. Only SGF records captures.
+    """
+    path = pathlib.Path(path)
+    if path.exists() is False:
+        raise Exception(f"Input, {path}, does not exist.")
+
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        return load_npy(path), _empty_captures()
+    elif suffix == ".txt":
+        return parse_diagram(path.read_text()), _empty_captures()
+    elif suffix == ".sgf":
+        return parse_sgf(path.read_text())
+    else:
+        raise Exception(f"Unsupported grid format, {suffix}. Use one of {GRID_FORMATS}")
@@ -6,7 +6,9 @@ from collections import Counter
 from dataclasses import dataclass, field
 from loguru import logger
 
+from GoAT.metrics import Metrics, NULL_METRICS
 from .board import Board
+from .encoding import EMPTY
 
 SCORING_SYSTEMS = ["Japanese", "Chinese"]
 
@@ -17,6 +19,10 @@ class Score:
     system: str
     komi: bool = True
     scores: Dict[str, int] = field(init=False)
+    # Points proven to be each player's territory.
+    safe_territory: Dict[str, int] = field(init=False)
+    # Metrics of last scored board. Includes recognition if shared with load_board.
+    metrics: Metrics = field(init=False, repr=False)
 
     def validate_fields(self):
         if self.system not in SCORING_SYSTEMS:
@@ -24,6 +30,8 @@ class Score:
 
     def __post_init__(self):
         self.scores = Counter()
+        self.safe_territory = Counter()
+        self.metrics = NULL_METRICS
         self.validate_fields()
 
     @property
@@ -95,8 +103,27 @@ class Score:
             )
             logger.info(f"Added {self.scores['White']} to white's score\n")
 
+        for color, points in board.safe_territory.items():
+            self.safe_territory[color] = len(points)
+        logger.info(f"Proven territory by Benson's algorithm: {self.safe_territory}")
+
         for region in board.regions:
-            if np.isnan(region.color_val):
+            if region.color_val == EMPTY:
+                # Empty board. No player owns territory.
+                if not region.n_adj_pieces:
+                    logger.info("Territory without adjacent pieces. Ignored.")
+                    continue
+
+                # Can't be dame or seki so skip checks.
+                if region.safe_owner is not None:
+                    color = board.colors.inverse[region.safe_owner]
+                    self.scores[color] += len(region)
+                    logger.info(
+                        f"Added proven territory of {len(region)} pieces to {color}'s score."
+                    )
+                    logger.info(f"{region}")
+                    continue
+
                 n_adjs = list(region.n_adj_pieces.values())
                 equal_adj = all(n_adjs[0] == n_adj for n_adj in n_adjs)
 
@@ -159,10 +186,17 @@ class Score:
         return self
 
     def score(self, board: Board):
+        """
+        Score board, keeping its metrics with the time spent scoring in metrics.
+
+        :return: scores for each color.
+        """
         logger.info(f"Scoring board using {self.system} scoring.")
 
         # Calculate scores with given method.
-        self._calculate_score(board)
+        with board.metrics.timer("score"):
+            self._calculate_score(board)
+        self.metrics = board.metrics
 
         # Add komi if desired.
         if self.komi:
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import contextlib
+import json
+import time
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Dict, Iterator, Union
+
+# Shared no-op context so disabled timers don't allocate.
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+@dataclass
+class Metrics:
+    """
+    Per-stage wall time and counts for a single run of the pipeline.
+
+    - timings: total secs spent in each stage.
+    - calls: number of times each stage ran.
+    - counts: running totals. ex. contours, joins, dead groups.
+    - gauges: last recorded value. ex. regions.
+    """
+
+    timings: Dict[str, float] = field(default_factory=dict)
+    calls: Counter = field(default_factory=Counter)
+    counts: Counter = field(default_factory=Counter)
+    gauges: Dict[str, Union[int, float]] = field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = (
+                self.timings.get(stage, 0.0) + time.perf_counter() - start
+            )
+            self.calls[stage] += 1
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] += n
+
+    def gauge(self, name: str, value: Union[int, float]):
+        self.gauges[name] = value
+
+    def merge(self, other: Metrics):
+        """
+        Add timings, calls and counts of other metrics. ex. of boards scored in workers.
+        Gauges take the value of other as it was recorded last.
+        """
+        for stage, secs in other.timings.items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + secs
+        self.calls.update(other.calls)
+        self.counts.update(other.counts)
+        self.gauges.update(other.gauges)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timings": dict(self.timings),
+            "calls": dict(self.calls),
+            "counts": dict(self.counts),
+            "gauges": dict(self.gauges),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "goat") -> str:
+        """
+        Format metrics in Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Wall time spent in stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        for stage, secs in self.timings.items():
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {secs:.9f}')
+
+        lines.extend(
+            [
+                f"# HELP {prefix}_stage_calls_total Number of times stage ran.",
+                f"# TYPE {prefix}_stage_calls_total counter",
+            ]
+        )
+        for stage, n in self.calls.items():
+            lines.append(f'{prefix}_stage_calls_total{{stage="{stage}"}} {n}')
+
+        for name, n in self.counts.items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {n}")
+
+        for name, value in self.gauges.items():
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class NullMetrics(Metrics):
+    """
+    Metrics that record nothing. Default when instrumentation is disabled.
+    """
+
+    # Hashable so it can be used as a dataclass field default.
+    __hash__ = object.__hash__
+
+    def timer(self, stage: str) -> ContextManager:
+        return _NULL_CONTEXT
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def gauge(self, name: str, value: Union[int, float]):
+        pass
+
+    def merge(self, other: Metrics):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+
+from GoAT.service.server import ScoringService
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve Go board scoring over HTTP.")
+    ap.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind.")
+    ap.add_argument("--port", type=int, default=8080, help="Port to bind.")
+    ap.add_argument(
+        "-w", "--workers", type=int, default=2, help="Number of worker processes."
+    )
+    ap.add_argument(
+        "--max_pending",
+        type=int,
+        default=64,
+        help="Pending requests before new requests are rejected with 503.",
+    )
+    ap.add_argument(
+        "--batch_size", type=int, default=16, help="Max grids scored per batch."
+    )
+    ap.add_argument(
+        "--batch_window",
+        type=float,
+        default=5.0,
+        help="Max time in ms to wait to fill a batch of grids.",
+    )
+    ap.add_argument(
+        "--read_timeout",
+        type=float,
+        default=10.0,
+        help="Max secs to receive a request before responding with 408.",
+    )
+    args = ap.parse_args()
+
+    service = ScoringService(
+        host=args.host,
+        port=args.port,
+        max_workers=args.workers,
+        max_pending=args.max_pending,
+        batch_size=args.batch_size,
+        batch_window=args.batch_window / 1000,
+        read_timeout=args.read_timeout,
+    )
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+from __future__ import annotations
+import asyncio
+import json
+import signal
+import statistics
+import urllib.parse
+import numpy as np
+import bidict
+
+from collections import Counter, deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from loguru import logger
+
+from GoAT.metrics import Metrics
+from GoAT.logic.board import Board
+from GoAT.logic.scoring import Score
+from GoAT.logic.encoding import COLORS, from_float, to_float
+
+ROUTES = {
+    "/score/image": "POST",
+    "/score/grid": "POST",
+    "/metrics": "GET",
+    "/health": "GET",
+}
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _init_worker():
+    # Per-board log messages are too verbose for a service.
+    logger.disable("GoAT")
+
+
+def _score_grid(
+    grid: np.ndarray,
+    scoring: str,
+    komi: bool,
+    captures: Dict[str, int],
+    metrics: Metrics,
+) -> Dict[str, float]:
+    scoreboard = Score(scoring, komi=komi)
+    board = Board(
+        grid=grid,
+        captures=Counter({"Black": 0, "White": 0, **captures}),
+        colors=bidict.bidict(COLORS),
+        metrics=metrics,
+    )
+    board.clear_dead_regions()
+    scores = scoreboard.score(board)
+    # Convert numpy scalars so scores are JSON serializable.
+    return {color: float(score) for color, score in scores.items()}
+
+
+def score_image(
+    data: bytes, scoring: str, komi: bool, captures: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Recognize and score an encoded image of a goban. Runs in a worker process.
+
+    :return: recognized grid, with 1.0 as black, 0.0 as white and None as empty,
+        scores and per-stage metrics.
+    """
+    # Only import OpenCV in workers that recognize images.
+    from GoAT.vision.loader import load_board_from_bytes
+
+    metrics = Metrics()
+    grid = load_board_from_bytes(data, metrics=metrics)
+    scores = _score_grid(grid.copy(), scoring, komi, captures, metrics)
+    grid_json = [
+        [None if np.isnan(val) else val for val in row] for row in to_float(grid)
+    ]
+    return {"grid": grid_json, "scores": scores, "metrics": metrics.to_dict()}
+
+
+def score_grids(requests: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+    """
+    Score a batch of grid scoring requests. Runs in a worker process.
+
+    :param requests: grid requests with keys grid, scoring, komi and captures.
+
+    :return: (success, scores and metrics or error message) for each request.
+    """
+    results = []
+    for request in requests:
+        try:
+            metrics = Metrics()
+            # Grids in requests use legacy float encoding with null as empty.
+            grid = from_float(np.array(request["grid"], dtype=float))
+            scores = _score_grid(
+                grid,
+                request["scoring"],
+                request["komi"],
+                request["captures"],
+                metrics,
+            )
+            results.append((True, {"scores": scores, "metrics": metrics.to_dict()}))
+        except Exception as err:
+            results.append((False, str(err)))
+    return results
+
+
+def _parse_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse scoring options from a JSON body or query string.
+    """
+    komi = options.get("komi", False)
+    if isinstance(komi, str):
+        komi = komi.lower() in ("1", "true", "yes")
+    try:
+        captures = {
+            "Black": int(options.get("cap_blk", 0)),
+            "White": int(options.get("cap_wht", 0)),
+        }
+    except (TypeError, ValueError) as err:
+        raise HTTPError(400, f"Invalid captures. {err}")
+
+    scoring = options.get("scoring")
+    if scoring is None:
+        raise HTTPError(400, "Missing scoring method.")
+
+    return {"scoring": scoring, "komi": bool(komi), "captures": captures}
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    idx = min(len(sorted_vals) - 1, int(round(pct / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+
+@dataclass
+class ScoringService:
+    """
+    Asyncio HTTP service for scoring goban images and grids.
+
+    Endpoints:
+        - POST /score/image: Encoded image body. Options in query string.
+        - POST /score/grid: JSON body with grid and options.
+        - GET /metrics: Latency percentiles and queue depth.
+        - GET /health
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8080
+    max_workers: int = 2
+    # Max requests waiting on or running in worker pool before rejecting new ones.
+    max_pending: int = 64
+    # Max grids scored in a single worker call and max secs to wait to fill a batch.
+    batch_size: int = 16
+    batch_window: float = 0.005
+    max_body_size: int = 16 * 1024 * 1024
+    # Max secs to receive a request before closing the connection.
+    read_timeout: float = 10.0
+    n_latencies: int = 1000
+
+    pending: int = field(init=False, default=0)
+    n_batches: int = field(init=False, default=0)
+    n_batched_grids: int = field(init=False, default=0)
+    n_pool_restarts: int = field(init=False, default=0)
+    latencies: Dict[str, Deque[float]] = field(init=False)
+    status_counts: Counter = field(init=False)
+
+    def __post_init__(self):
+        self.latencies = {}
+        self.status_counts = Counter()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._grid_queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._connections: Set[asyncio.Task] = set()
+        # Connections that haven't sent a full request yet.
+        self._reading: Set[asyncio.Task] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        return self.pending
+
+    @property
+    def pool_broken(self) -> bool:
+        # Set once a worker dies, even if no request was running.
+        return bool(getattr(self._pool, "_broken", False))
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        """
+        Replace a broken worker pool. Only the first caller with the same broken
+        pool replaces it so concurrent failures start one new pool.
+        """
+        if self._pool is not broken:
+            return
+        logger.warning("Worker pool is broken. Starting a new pool.")
+        self._pool = self._new_pool()
+        self.n_pool_restarts += 1
+        broken.shutdown(wait=False)
+
+    async def start(self) -> ScoringService:
+        self._pool = self._new_pool()
+        self._grid_queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_grids())
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        # Update port in case an ephemeral port (0) was requested.
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Scoring service listening on http://{self.host}:{self.port}")
+        return self
+
+    async def stop(self):
+        """
+        Stop accepting connections, finish in-flight requests and shutdown workers.
+        """
+        logger.info("Shutting down scoring service.")
+        self._server.close()
+        await self._server.wait_closed()
+
+        # Drop connections that haven't sent a request. Idle clients can't block shutdown.
+        for task in list(self._reading):
+            task.cancel()
+
+        # Finish open connections. These may still be queueing grids.
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+        # Flush remaining grids then stop batcher.
+        await self._grid_queue.put(None)
+        await self._batcher
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        self._pool.shutdown(wait=True)
+        logger.info("Scoring service stopped.")
+
+    async def serve_forever(self):
+        """
+        Run service until SIGINT or SIGTERM.
+        """
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+
+        await self.start()
+        await stop_event.wait()
+        await self.stop()
+
+    def metrics(self) -> Dict[str, Any]:
+        requests = {}
+        for route, latencies in self.latencies.items():
+            sorted_latencies = sorted(latencies)
+            requests[route] = {
+                "count": len(sorted_latencies),
+                "mean_ms": statistics.mean(sorted_latencies) * 1000,
+                **{
+                    f"p{pct}_ms": _percentile(sorted_latencies, pct) * 1000
+                    for pct in (50, 90, 99)
+                },
+            }
+        return {
+            "requests": requests,
+            "status": dict(self.status_counts),
+            "queue_depth": self.queue_depth,
+            "grid_queue_depth": self._grid_queue.qsize() if self._grid_queue else 0,
+            "batches": self.n_batches,
+            "batched_grids": self.n_batched_grids,
+            "pool_restarts": self.n_pool_restarts,
+        }
+
+    async def _run_in_pool(self, func, *args):
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            return await loop.run_in_executor(pool, func, *args)
+        except BrokenExecutor as err:
+            # Requests running when a worker died fail. They aren't retried as they
+            # may have killed it. Later requests run in a new pool.
+            self._replace_pool(pool)
+            raise HTTPError(500, f"Worker pool failed. {err}")
+
+    def _acquire(self):
+        if self.pending >= self.max_pending:
+            raise HTTPError(503, "Too many pending requests.")
+        self.pending += 1
+
+    async def _batch_grids(self):
+        """
+        Collect queued grid requests into batches and score each batch in one worker call.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._grid_queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self._grid_queue.get(), timeout)
+                    else:
+                        item = self._grid_queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        self.n_batches += 1
+        self.n_batched_grids += len(batch)
+        requests = [request for request, _ in batch]
+        try:
+            results = await self._run_in_pool(score_grids, requests)
+        except HTTPError as err:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        except Exception as err:
+            results = [(False, str(err))] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _score_grid(self, body: bytes) -> Dict[str, Any]:
+        try:
+            payload = json.loads(body)
+        except ValueError as err:
+            raise HTTPError(400, f"Invalid JSON. {err}")
+        if not isinstance(payload, dict) or "grid" not in payload:
+            raise HTTPError(400, "Missing grid.")
+
+        request = {"grid": payload["grid"], **_parse_options(payload)}
+
+        self._acquire()
+        try:
+            future = asyncio.get_running_loop().create_future()
+            await self._grid_queue.put((request, future))
+            success, result = await future
+        finally:
+            self.pending -= 1
+
+        if not success:
+            raise HTTPError(400, result)
+        return result
+
+    async def _score_image(
+        self, query: Dict[str, List[str]], body: bytes
+    ) -> Dict[str, Any]:
+        if not body:
+            raise HTTPError(400, "Missing image.")
+        options = _parse_options({key: vals[-1] for key, vals in query.items()})
+
+        self._acquire()
+        try:
+            return await self._run_in_pool(
+                score_image,
+                body,
+                options["scoring"],
+                options["komi"],
+                options["captures"],
+            )
+        except HTTPError:
+            raise
+        except Exception as err:
+            raise HTTPError(400, str(err))
+        finally:
+            self.pending -= 1
+
+    async def _route(
+        self, method: str, path: str, query: Dict[str, List[str]], body: bytes
+    ) -> Dict[str, Any]:
+        if path not in ROUTES:
+            raise HTTPError(404, f"Unknown path, {path}.")
+        if method != ROUTES[path]:
+            raise HTTPError(405, f"{method} not allowed for {path}.")
+
+        if path == "/score/image":
+            return await self._score_image(query, body)
+        elif path == "/score/grid":
+            return await self._score_grid(body)
+        elif path == "/metrics":
+            return self.metrics()
+        elif self.pool_broken:
+            self._replace_pool(self._pool)
+            raise HTTPError(503, "Worker pool is broken. Starting a new pool.")
+        else:
+            return {"status": "ok"}
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[str, str, Dict[str, List[str]], bytes]:
+        request_line = await reader.readline()
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Invalid request line.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, val = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = val.strip()
+
+        try:
+            content_length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length.")
+        if content_length > self.max_body_size:
+            raise HTTPError(413, f"Body larger than {self.max_body_size} bytes.")
+        body = await reader.readexactly(content_length)
+
+        url = urllib.parse.urlsplit(target)
+        return method, url.path, urllib.parse.parse_qs(url.query), body
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        path = None
+        try:
+            try:
+                self._reading.add(task)
+                try:
+                    method, path, query, body = await asyncio.wait_for(
+                        self._read_request(reader), self.read_timeout
+                    )
+                finally:
+                    self._reading.discard(task)
+                status, payload = 200, await self._route(method, path, query, body)
+            except HTTPError as err:
+                status, payload = err.status, {"error": err.message}
+            except asyncio.IncompleteReadError:
+                status, payload = 400, {"error": "Incomplete body."}
+            except asyncio.TimeoutError:
+                status, payload = 408, {"error": "Timed out reading request."}
+
+            content = json.dumps(payload).encode()
+            headers = [
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(content)}",
+                "Connection: close",
+            ]
+            if status == 503:
+                headers.append("Retry-After: 1")
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + content)
+            await writer.drain()
+
+            self.status_counts[status] += 1
+            if path in ROUTES:
+                self.latencies.setdefault(path, deque(maxlen=self.n_latencies)).append(
+                    loop.time() - start
+                )
+        except ConnectionError:
+            logger.warning("Client disconnected before response was sent.")
+        finally:
+            writer.close()
+            self._connections.discard(task)
@@ -0,0 +1,206 @@
+"""
+Persistent cache of recognized boards keyed by image content.
+
+Keys are a SHA-256 of the encoded image bytes and detection parameters so copied or
+renamed images still hit and changing any parameter or the engine misses.
+Entries are written to a temporary file and atomically renamed so concurrent
+workers never read a partial entry. Once the cache is larger than its cap, least
+recently used entries are evicted.
+"""
+
+from __future__ import annotations
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+from loguru import logger
+
+# Bump if entries or recognition change in a way not captured by parameters.
+CACHE_VERSION = 3
+ENTRY_SUFFIX = ".npz"
+TMP_SUFFIX = ".tmp"
+# Default max size of cache in bytes.
+MAX_CACHE_BYTES = 256 * 2**20
+# Fraction of max size to evict down to so every write doesn't trigger eviction.
+EVICT_TO = 0.8
+# Secs after which temporary files left by crashed workers are removed.
+STALE_TMP_AGE = 3600
+
+# Encoded image data or decoded image.
+CacheData = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+@dataclass
+class Recognition:
+    """
+    Recognized board.
+
+    - grid: int8 grid where 0 is empty, 1 is black and 2 is white.
+    - x_lattice: px position of each board column in the canonical board image,
+      in order of board coordinate.
+    - y_lattice: px position of each board row.
+    """
+
+    grid: np.ndarray
+    x_lattice: np.ndarray
+    y_lattice: np.ndarray
+
+
+def _remove(path: pathlib.Path):
+    # Another worker may have already evicted it.
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+
+class RecognitionCache:
+    """
+    On-disk cache of recognized boards.
+
+    Safe to share between processes. The size cap is approximate as each process
+    only counts its own writes between scans of the cache.
+    """
+
+    def __init__(
+        self, directory: Union[str, os.PathLike], max_bytes: int = MAX_CACHE_BYTES
+    ):
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Size of entries in bytes. Scanned on first write.
+        self._size: Optional[int] = None
+
+    def key(self, data: CacheData, params: Dict[str, Any]) -> str:
+        """
+        :param data: encoded image bytes or decoded image.
+        :param params: JSON serializable detection parameters.
+
+        :return: hex digest of image and parameters.
+        """
+        digest = hashlib.sha256()
+        if isinstance(data, np.ndarray):
+            # Images with the same pixels but different shapes must differ.
+            digest.update(f"array:{data.shape}:{data.dtype.str}".encode())
+            data = np.ascontiguousarray(data)
+        digest.update(data)
+        digest.update(
+            json.dumps({"version": CACHE_VERSION, **params}, sort_keys=True).encode()
+        )
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        # Shard by prefix to keep directories small.
+        return self.directory / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Recognition]:
+        """
+        :return: recognized board. None if not cached.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                recognition = Recognition(
+                    grid=entry["grid"],
+                    x_lattice=entry["x_lattice"],
+                    y_lattice=entry["y_lattice"],
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.warning(f"Removing unreadable cache entry, {path}: {err}")
+            _remove(path)
+            return None
+
+        # Mark as recently used.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return recognition
+
+    def put(self, key: str, recognition: Recognition):
+        """
+        Store recognized board and evict least recently used entries if over cap.
+        """
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(
+                    fh,
+                    grid=recognition.grid,
+                    x_lattice=recognition.x_lattice,
+                    y_lattice=recognition.y_lattice,
+                )
+            # Atomic so readers see either no entry or a complete one.
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            with contextlib.suppress(OSError):
+                self._size += path.stat().st_size
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _scan(self) -> List[Tuple[float, int, pathlib.Path]]:
+        """
+        :return: last use, size and path of each entry. Oldest first.
+        """
+        entries = []
+        now = time.time()
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == ENTRY_SUFFIX:
+                entries.append((stat.st_mtime, stat.st_size, path))
+            elif path.suffix == TMP_SUFFIX and now - stat.st_mtime > STALE_TMP_AGE:
+                _remove(path)
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        """
+        :return: total size of entries in bytes.
+        """
+        return sum(size for _, size, _ in self._scan())
+
+    def __len__(self) -> int:
+        return len(self._scan())
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Remove least recently used entries until cache fits.
+
+        :param max_bytes: size to evict down to. Defaults to a fraction of the cap.
+
+        :return: number of entries removed.
+        """
+        if max_bytes is None:
+            max_bytes = int(self.max_bytes * EVICT_TO)
+
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        n_removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            _remove(path)
+            total -= size
+            n_removed += 1
+
+        self._size = total
+        logger.info(f"Evicted {n_removed} cache entries. Cache is {total} bytes.")
+        return n_removed
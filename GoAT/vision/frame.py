@@ -0,0 +1,174 @@
+"""
+Recognize and score every board in an image with several boards.
+
+Boards are located by their outlines, warped to canonical images in the calling
+process and then recognized and scored concurrently in a process pool.
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import os
+import bidict
+import cv2
+import numpy as np
+
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from GoAT.metrics import Metrics, NULL_METRICS
+from GoAT.logic.board import Board
+from GoAT.logic.encoding import COLORS
+from GoAT.logic.scoring import Score
+from GoAT.vision.loader import (
+    BOARD_DIMS,
+    DEFAULT_PARAMS,
+    ROI_SIZE,
+    DetectionParams,
+    ImageSource,
+    ParamsLike,
+    as_params,
+    crop_board,
+    load_board_from_array,
+    locate_boards,
+    read_image,
+    warp_board,
+    warp_canonical,
+)
+
+# x, y, width and height in px of original image.
+BBox = Tuple[int, int, int, int]
+
+
+@dataclass
+class BoardResult:
+    bbox: BBox
+    grid: Optional[np.ndarray] = field(default=None, repr=False)
+    scores: Optional[Dict[str, float]] = None
+    metrics: Metrics = field(default_factory=Metrics, repr=False)
+    # Reason board could not be recognized or scored.
+    error: Optional[str] = None
+
+
+def _init_worker():
+    # Per-board log messages from several workers are too verbose.
+    logger.disable("GoAT")
+
+
+def _score_board(
+    roi: np.ndarray,
+    bbox: BBox,
+    scoring: str,
+    komi: bool,
+    board_dims: Optional[Sequence[int]],
+    params: DetectionParams,
+) -> BoardResult:
+    """
+    Recognize and score a single canonical board image. Runs in a worker process.
+    """
+    result = BoardResult(bbox)
+    try:
+        grid = load_board_from_array(
+            roi,
+            localize=False,
+            metrics=result.metrics,
+            board_dims=board_dims,
+            params=params,
+        )
+        board = Board(
+            grid=grid.copy(),
+            captures=Counter({"Black": 0, "White": 0}),
+            colors=bidict.bidict(COLORS),
+            metrics=result.metrics,
+        ).clear_dead_regions()
+        # Scores are returned instead of printed.
+        with contextlib.redirect_stdout(io.StringIO()):
+            scores = Score(scoring, komi=komi).score(board)
+    except Exception as err:
+        result.error = str(err)
+        return result
+
+    result.grid = grid
+    # Convert numpy scalars.
+    result.scores = {color: float(score) for color, score in scores.items()}
+    return result
+
+
+def score_frame(
+    src: ImageSource,
+    scoring: str,
+    komi: bool = True,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: ParamsLike = DEFAULT_PARAMS,
+    metrics: Metrics = NULL_METRICS,
+) -> List[BoardResult]:
+    """
+    Recognize and score every board in an image.
+
+    :param src: image path, encoded buffer, binary file-like or decoded image.
+    :param scoring: scoring system of every board.
+    :param komi: apply komi.
+    :param max_workers: max worker processes. Boards are scored in this process if 1.
+    :param executor: existing pool to score boards in. Reuse across frames to avoid
+        starting workers for each frame.
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+    :param params: detection thresholds or name of saved profile.
+    :param metrics: records time spent decoding, locating and warping boards. The
+        metrics of every board are merged into it once scored.
+
+    :return: grid, scores and bounding box of each board in reading order.
+        If no board outlines are found, the image is scored as a single board.
+    """
+    # Load profile once instead of in each worker.
+    params = as_params(params)
+    with metrics.timer("decode"):
+        img = read_image(src)
+
+    with metrics.timer("locate_boards"):
+        boards = locate_boards(img)
+
+    with metrics.timer("warp_board"):
+        jobs = []
+        for corners in boards:
+            bbox = cv2.boundingRect(corners.astype(np.int32))
+            if board_dims is None:
+                roi = warp_canonical(img, corners, board_dims, params)
+            else:
+                # Like crop_board, only downscale. Detection is tuned to rendered scale.
+                roi = warp_board(img, corners, min(ROI_SIZE, max(bbox[2:])))
+            jobs.append((roi, bbox))
+        if not jobs:
+            height, width = img.shape[:2]
+            roi = crop_board(img, board_dims=board_dims, params=params)
+            jobs = [(roi, (0, 0, width, height))]
+    metrics.count("boards", len(jobs))
+
+    if executor is None and (max_workers == 1 or len(jobs) == 1):
+        results = [
+            _score_board(roi, bbox, scoring, komi, board_dims, params)
+            for roi, bbox in jobs
+        ]
+    else:
+        with contextlib.ExitStack() as stack:
+            if executor is None:
+                n_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker)
+                )
+            futures = [
+                executor.submit(
+                    _score_board, roi, bbox, scoring, komi, board_dims, params
+                )
+                for roi, bbox in jobs
+            ]
+            results = [future.result() for future in futures]
+
+    # Boards scored in workers record metrics separately.
+    for result in results:
+        metrics.merge(result.metrics)
+    return results
@@ -1,11 +1,139 @@
 import os
+import json
+import pathlib
 import cv2
 import statistics
 import imutils
 import numpy as np
 
+from dataclasses import asdict, dataclass
 from loguru import logger
-from typing import Tuple, List, Dict, Iterator, Union
+from typing import Tuple, List, Dict, Iterator, Optional, Sequence, Union, BinaryIO
+
+from GoAT.metrics import Metrics, NULL_METRICS
+from GoAT.logic.encoding import BLACK, WHITE, empty_grid
+from GoAT.vision.cache import Recognition, RecognitionCache
+
+# Encoded image data that can be decoded without copying.
+ImageBuffer = Union[bytes, bytearray, memoryview]
+# Any supported image input. Paths, encoded buffers, binary file-likes or decoded images.
+ImageSource = Union[str, os.PathLike, ImageBuffer, BinaryIO, np.ndarray]
+
+# Side length in px of canonical board image that detection runs on.
+# Matches scale of rendered 19x19 boards in docs/images.
+ROI_SIZE = 441
+# Min px between lines kept when downscaling boards of unknown size. Matches ROI_SIZE.
+MIN_LINE_PX = 23
+# Max lines along an axis of boards of unknown size that keep MIN_LINE_PX.
+MAX_FREE_LINES = 61
+# Max side length in px of downscaled copy used to locate board.
+LOCATE_MAX_DIM = 500
+# Fraction of frame that board outline must cover to be considered.
+MIN_BOARD_AREA = 0.2
+# Fraction of frame above which image is considered already cropped to board.
+FULL_FRAME_AREA = 0.95
+# Fraction of frame that each board outline must cover in images with several boards.
+MIN_FRAME_BOARD_AREA = 0.01
+# Standard square board sizes that estimated dimensions are snapped to by default.
+BOARD_DIMS = [5, 9, 13, 19]
+# Library that detects pieces. Part of cache keys so upgrades invalidate results.
+ENGINE = f"opencv-{cv2.__version__}"
+# Directory of named detection profiles. See GoAT.vision.tuning.
+PROFILE_DIR = pathlib.Path(__file__).parent / "profiles"
+# Number of line spacings tried when fitting board lines to pieces.
+LATTICE_STEPS = 512
+
+
+@dataclass(frozen=True)
+class DetectionParams:
+    """
+    Thresholds used to detect pieces in a canonical board image.
+
+    - blur_size: side length in px of Gaussian blur kernel. Must be odd.
+    - black_threshold: max brightness of black pieces.
+    - white_threshold: min brightness of white pieces.
+    - dist_ratio: fraction of max distance to background that centers of black
+      pieces must exceed.
+    - cluster_gap: max px between piece centers in the same row or column.
+    """
+
+    blur_size: int = 9
+    black_threshold: int = 100
+    white_threshold: int = 200
+    dist_ratio: float = 0.7
+    cluster_gap: int = 5
+
+    def __post_init__(self):
+        if self.blur_size < 1 or self.blur_size % 2 == 0:
+            raise Exception(f"Blur size must be odd and positive. {self.blur_size}")
+        if not 0 <= self.black_threshold < self.white_threshold <= 255:
+            raise Exception(
+                "Thresholds must be 0 <= black < white <= 255. "
+                f"({self.black_threshold}, {self.white_threshold})"
+            )
+        if not 0 < self.dist_ratio <= 1:
+            raise Exception(f"Distance ratio must be in (0, 1]. {self.dist_ratio}")
+        if self.cluster_gap < 0:
+            raise Exception(f"Cluster gap must not be negative. {self.cluster_gap}")
+
+
+DEFAULT_PARAMS = DetectionParams()
+# Detection parameters or name of saved profile.
+ParamsLike = Union[DetectionParams, str]
+
+
+def _profile_path(name: str, directory: Union[str, os.PathLike]) -> pathlib.Path:
+    return pathlib.Path(directory) / f"{name}.json"
+
+
+def save_profile(
+    name: str,
+    params: DetectionParams,
+    directory: Union[str, os.PathLike] = PROFILE_DIR,
+    **info,
+) -> pathlib.Path:
+    """
+    Save detection parameters as a named profile.
+
+    :param name: name of profile.
+    :param params: detection parameters.
+    :param directory: directory of profiles.
+    :param info: JSON serializable info stored alongside parameters. ex. images tuned on.
+
+    :return: path to profile.
+    """
+    path = _profile_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"params": asdict(params), **info}, indent=2))
+    logger.info(f"Saved detection profile, {name}, to {path}.")
+    return path
+
+
+def load_profile(
+    name: str, directory: Union[str, os.PathLike] = PROFILE_DIR
+) -> DetectionParams:
+    """
+    Load detection parameters from a named profile.
+
+    :param name: name of profile in directory or path to profile.
+    :param directory: directory of profiles.
+
+    :return: detection parameters.
+    """
+    path = pathlib.Path(name)
+    if path.suffix != ".json" or not path.exists():
+        path = _profile_path(name, directory)
+    if not path.exists():
+        raise Exception(f"Detection profile, {name}, does not exist in {directory}.")
+
+    return DetectionParams(**json.loads(path.read_text())["params"])
+
+
+def as_params(params: ParamsLike) -> DetectionParams:
+    """
+    :return: detection parameters. Profiles are loaded by name.
+    """
+    return load_profile(params) if isinstance(params, str) else params
 
 
 class Piece:
@@ -92,32 +220,105 @@ def cluster_positions(positions, diff) -> Iterator[List]:
         yield group
 
 
+def fit_lattice(positions: Sequence[float], n_lines: int, length: float) -> np.ndarray:
+    """
+    Fit evenly spaced board lines to piece positions along one axis.
+
+    Lines are assumed to be centered in the board image with margins smaller than
+    the spacing between lines, so the spacing is between length / (n_lines + 1) and
+    length / (n_lines - 1). Only the spacing and offset that best align pieces with
+    lines are fit, so empty rows or columns don't shift pieces.
+
+    :param positions: px positions of piece centers along axis.
+    :param n_lines: number of board lines along axis.
+    :param length: px length of board image along axis.
+
+    :return: px position of each line.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if n_lines < 2:
+        return np.array([length / 2])
+
+    spacings = np.linspace(
+        length / (n_lines + 1), length / (n_lines - 1), LATTICE_STEPS
+    )
+    # Pieces on lines have the same phase for the correct spacing.
+    phases = np.exp(2j * np.pi * positions / spacings[:, np.newaxis]).mean(axis=1)
+    best = np.argmax(np.abs(phases))
+    spacing = spacings[best]
+    offset = np.angle(phases[best]) / (2 * np.pi) * spacing
+
+    # Center lines in image then shift them so every piece is on the board.
+    margin = (length - (n_lines - 1) * spacing) / 2
+    first = offset + round((margin - offset) / spacing) * spacing
+    coords = np.round((positions - first) / spacing)
+    if coords.max() - coords.min() > n_lines - 1:
+        raise Exception(
+            f"Pieces span {int(coords.max() - coords.min()) + 1} lines"
+            f" but board only has {n_lines}. Pieces may be outside of board."
+        )
+    first += (min(coords.min(), 0) + max(coords.max() - (n_lines - 1), 0)) * spacing
+
+    return first + spacing * np.arange(n_lines)
+
+
+def _line_spacing(pxls: List[float], distances: List[float]) -> float:
+    """
+    :param pxls: sorted px positions of clusters.
+    :param distances: px distances between adjacent clusters.
+
+    :return: px between board lines.
+    """
+    median_distance = statistics.median(distances)
+    # Median is whole px as positions are. Average distances close to it instead
+    # so error doesn't add up over many lines.
+    spacing = statistics.mean(
+        dist
+        for dist in distances
+        if abs(dist - median_distance) <= 0.3 * median_distance
+    )
+    span = pxls[-1] - pxls[0]
+    return span / max(round(span / spacing), 1)
+
+
 def get_board_size(
-    black_pieces: List[Piece], white_pieces: List[Piece]
+    black_pieces: List[Piece],
+    white_pieces: List[Piece],
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: DetectionParams = DEFAULT_PARAMS,
+    size: Optional[Tuple[int, int]] = None,
 ) -> Tuple[Tuple[int, int], Dict[float, int], Dict[float, int]]:
     """
     Get board size given piece contours.
 
+    :param board_dims: square board sizes to snap to. If None, estimate each axis
+        separately to allow rectangular or non-standard boards.
+    :param params: detection thresholds. Only cluster_gap is used.
+    :param size: px size of board image. (width, height) Defaults to extent of pieces
+        with equal margins.
+
     :return: Predicted board dimensions. (x, y)
-    :return: Mapping of median x/y pixel positions to x/y board coordinates. {px: coord}
+    :return: Mapping of x/y pixel positions of board lines to x/y board coordinates.
+        {px: coord}
     """
-    BOARD_DIMS = [5, 9, 13, 19]
-
-    x_pos = set()
-    y_pos = set()
-
-    for pieces in [black_pieces, white_pieces]:
-        for piece in pieces:
-            cX, cY = piece.center
-            x_pos.add(cX)
-            y_pos.add(cY)
+    centers = [
+        piece.center for pieces in [black_pieces, white_pieces] for piece in pieces
+    ]
+    x_pos = {cX for cX, _ in centers}
+    y_pos = {cY for _, cY in centers}
 
     # Sorted groups pixels into enumerated clusters
-    x_groups = dict(enumerate(cluster_positions(x_pos, 5), 1))
-    y_groups = dict(enumerate(cluster_positions(y_pos, 5), 1))
+    x_groups = dict(enumerate(cluster_positions(x_pos, params.cluster_gap), 1))
+    y_groups = dict(enumerate(cluster_positions(y_pos, params.cluster_gap), 1))
+
+    if max(len(x_groups), len(y_groups)) < 2:
+        raise Exception("Too few pieces detected to estimate board size.")
 
     # Replace axis with less coverage based on total # of pieces detected.
-    if len(x_groups) != len(y_groups):
+    # Non-standard boards only do so if an axis has too few pieces to measure spacing.
+    if len(x_groups) != len(y_groups) and (
+        board_dims is not None or min(len(x_groups), len(y_groups)) < 2
+    ):
         n_groups = [len(x_groups), len(y_groups)]
         larger_axis = n_groups.index(max(n_groups))
         # If x has better coverage.
@@ -141,33 +342,53 @@ def get_board_size(
     x_distances = [abs(x_pxls[i] - x_pxls[i + 1]) for i in range(len(x_pxls) - 1)]
     y_distances = [abs(y_pxls[i] - y_pxls[i + 1]) for i in range(len(y_pxls) - 1)]
 
-    median_x_distance = round(statistics.median(x_distances), 0)
-    median_y_distance = round(statistics.median(y_distances), 0)
+    median_x_distance = _line_spacing(x_pxls, x_distances)
+    median_y_distance = _line_spacing(y_pxls, y_distances)
 
     # Divide largest px_pos by median distance to get number of intervals among dim.
     # Add 1 to account for final piece's additional pxs.
-    x_dim_length = (x_pxls[-1] // median_x_distance) + 1
-    y_dim_length = (y_pxls[-1] // median_y_distance) + 1
+    x_dim_length = int(x_pxls[-1] // median_x_distance) + 1
+    y_dim_length = int(y_pxls[-1] // median_y_distance) + 1
+
+    if board_dims is None:
+        # Every detected row and column must fit on the board.
+        dims = (max(x_dim_length, len(x_pxls)), max(y_dim_length, len(y_pxls)))
+    else:
+        largest_dim = max([x_dim_length, y_dim_length])
+
+        # For highest board dimension, we fit to a board that is closest in size.
+        abs_diff_dims = {dim: abs(largest_dim - dim) for dim in board_dims}
+        closest_board_dim = min(abs_diff_dims, key=abs_diff_dims.get)
+        dims = (closest_board_dim, closest_board_dim)
 
-    largest_dim = max([x_dim_length, y_dim_length])
+    if size is None:
+        size = (min(x_pos) + max(x_pos), min(y_pos) + max(y_pos))
 
-    # For highest board dimension, we fit to a board that is closest in size.
-    abs_diff_dims = {dim: abs(largest_dim - dim) for dim in BOARD_DIMS}
-    closest_board_dim = min(abs_diff_dims, key=abs_diff_dims.get)
+    # Map board lines rather than clusters so empty rows and columns are counted.
+    x_lattice = fit_lattice([cX for cX, _ in centers], dims[0], size[0])
+    y_lattice = fit_lattice([cY for _, cY in centers], dims[1], size[1])
+    x_map = {float(px): coord for coord, px in enumerate(x_lattice, 1)}
+    y_map = {float(px): coord for coord, px in enumerate(y_lattice, 1)}
 
-    return (closest_board_dim, closest_board_dim), x_positions, y_positions
+    return dims, x_map, y_map
 
 
-def get_pieces(img: np.ndarray) -> Tuple[List[Piece], List[Piece]]:
+def get_pieces(
+    img: np.ndarray, params: DetectionParams = DEFAULT_PARAMS
+) -> Tuple[List[Piece], List[Piece]]:
     """
     Get pieces from image based on thresholded contours.
 
+    :param params: detection thresholds.
+
     :return:  Black and white pieces as Piece objects.
     """
     # Blur image so threshold only show pieces
-    blur = cv2.GaussianBlur(img, (9, 9), 0)
+    blur = cv2.GaussianBlur(img, (params.blur_size, params.blur_size), 0)
 
-    _, thresh_blk = cv2.threshold(blur, 100, 255, cv2.THRESH_BINARY_INV)
+    _, thresh_blk = cv2.threshold(
+        blur, params.black_threshold, 255, cv2.THRESH_BINARY_INV
+    )
 
     # Distance transform for a binary image:
     # - Finds distance from a pixel to the closest non empty pixel.
@@ -175,11 +396,13 @@ def get_pieces(img: np.ndarray) -> Tuple[List[Piece], List[Piece]]:
     # - https://homepages.inf.ed.ac.uk/rbf/CVDICT/cvd.htm#tag435
     dist_transform = cv2.distanceTransform(thresh_blk, cv2.DIST_L2, 5)
     _, thresh_blk = cv2.threshold(
-        dist_transform, 0.7 * dist_transform.max(), 255, cv2.THRESH_BINARY
+        dist_transform, params.dist_ratio * dist_transform.max(), 255, cv2.THRESH_BINARY
     )
 
     # High threshold so only white pieces are turned to 0.
-    _, thresh_white = cv2.threshold(blur, 200, 255, cv2.THRESH_BINARY)
+    _, thresh_white = cv2.threshold(
+        blur, params.white_threshold, 255, cv2.THRESH_BINARY
+    )
 
     thresh_blk, thresh_white = thresh_blk.astype("uint8"), thresh_white.astype("uint8")
     contours_blk = cv2.findContours(
@@ -193,45 +416,330 @@ def get_pieces(img: np.ndarray) -> Tuple[List[Piece], List[Piece]]:
         contours_blk
     ), imutils.grab_contours(contours_white)
 
-    black_pieces = [Piece(cnt, "black") for cnt in contours_blk]
-    white_pieces = [Piece(cnt, "white") for cnt in contours_white]
+    # Ignore degenerate contours with no area as they have no center.
+    black_pieces = [
+        Piece(cnt, "black") for cnt in contours_blk if cv2.moments(cnt)["m00"] != 0
+    ]
+    white_pieces = [
+        Piece(cnt, "white") for cnt in contours_white if cv2.moments(cnt)["m00"] != 0
+    ]
     return black_pieces, white_pieces
 
 
-def load_board(img_path: str) -> np.ndarray:
+def order_corners(corners: np.ndarray) -> np.ndarray:
     """
-    Load board as np array from image of goban.
-    :param img_path:
+    Order four corner points as top-left, top-right, bottom-right, bottom-left.
 
-    :return: goban as matrix where 1.0 is black and 0.0 is white.
+    :param corners: array of four (x, y) points.
+
+    :return: ordered corners as float32 array of shape (4, 2).
     """
-    if os.path.exists(img_path) is False:
-        raise Exception(f"Image, {img_path}, does not exist.")
+    corners = corners.reshape(4, 2).astype("float32")
+    ordered = np.zeros((4, 2), dtype="float32")
 
-    original = cv2.imread(img_path)
-    logger.info(f"Initializing goban from image: {img_path}")
+    # Top-left has smallest x + y and bottom-right the largest.
+    coord_sum = corners.sum(axis=1)
+    ordered[0] = corners[np.argmin(coord_sum)]
+    ordered[2] = corners[np.argmax(coord_sum)]
 
-    gray = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
+    # Top-right has smallest y - x and bottom-left the largest.
+    coord_diff = np.diff(corners, axis=1).ravel()
+    ordered[1] = corners[np.argmin(coord_diff)]
+    ordered[3] = corners[np.argmax(coord_diff)]
+    return ordered
 
-    black_pieces, white_pieces = get_pieces(gray)
 
-    (dim_x, dim_y), x_map, y_map = get_board_size(black_pieces, white_pieces)
-    logger.info(f"Estimated dimensions of board: (x: {dim_x}, y: {dim_y})")
+def _board_outlines(img: np.ndarray) -> Tuple[List[np.ndarray], float, int]:
+    """
+    Find outlines of bright objects in a downscaled copy of the image.
+
+    :param img: BGR or grayscale image.
+
+    :return: contours in px of downscaled image, scale of downscaled image and
+        area of downscaled image in px.
+    """
+    height, width = img.shape[:2]
+    scale = min(1.0, LOCATE_MAX_DIM / max(height, width))
+    small = cv2.resize(
+        img, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA
+    )
+    gray = small if small.ndim == 2 else cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+
+    # Board is brighter than the background so Otsu's threshold separates the two.
+    _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    contours = imutils.grab_contours(
+        cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    )
+    return list(contours), scale, thresh.shape[0] * thresh.shape[1]
+
+
+def _approx_corners(board_cnt: np.ndarray) -> Union[np.ndarray, None]:
+    """
+    :return: 4 corners of board contour. None if not roughly a quadrilateral.
+    """
+    # Use hull so stones on the edge of the board don't dent the outline.
+    hull = cv2.convexHull(board_cnt)
+    approx = cv2.approxPolyDP(hull, 0.02 * cv2.arcLength(hull, True), True)
+    if len(approx) != 4:
+        return None
+    return approx
+
+
+def locate_board(img: np.ndarray) -> Union[np.ndarray, None]:
+    """
+    Locate board outline in image.
+
+    Runs on a downscaled copy of the image. The board is taken as the largest
+    bright contour that can be approximated by a quadrilateral.
+
+    :param img: BGR or grayscale image.
+
+    :return: ordered board corners in px of the original image.
+        None if no board outline is found or the board already fills the image.
+    """
+    contours, scale, frame_area = _board_outlines(img)
+    if not contours:
+        return None
+
+    board_cnt = max(contours, key=cv2.contourArea)
+    board_area = cv2.contourArea(board_cnt) / frame_area
+    if board_area < MIN_BOARD_AREA or board_area > FULL_FRAME_AREA:
+        return None
+
+    approx = _approx_corners(board_cnt)
+    if approx is None:
+        return None
+
+    logger.info(f"Located board covering {board_area:.0%} of image.")
+    return order_corners(approx / scale)
+
+
+def locate_boards(
+    img: np.ndarray, min_area: float = MIN_FRAME_BOARD_AREA
+) -> List[np.ndarray]:
+    """
+    Locate outlines of every board in an image with several boards.
+
+    :param img: BGR or grayscale image.
+    :param min_area: fraction of frame that a board outline must cover.
+
+    :return: ordered corners in px of the original image of each board.
+        Boards are in reading order, top to bottom and left to right.
+        Empty if no board outline is found or a single board fills the image.
+    """
+    contours, scale, frame_area = _board_outlines(img)
+
+    boards = []
+    for board_cnt in contours:
+        board_area = cv2.contourArea(board_cnt) / frame_area
+        if board_area < min_area or board_area > FULL_FRAME_AREA:
+            continue
+        approx = _approx_corners(board_cnt)
+        if approx is not None:
+            boards.append(order_corners(approx / scale))
+
+    # Boards with top edges within half a board of each other are in the same row.
+    boards.sort(key=lambda corners: corners[0][1])
+    rows: List[List[np.ndarray]] = []
+    for corners in boards:
+        height = corners[3][1] - corners[0][1]
+        if rows and corners[0][1] - rows[-1][0][0][1] < height / 2:
+            rows[-1].append(corners)
+        else:
+            rows.append([corners])
+
+    boards = [corners for row in rows for corners in sorted(row, key=lambda c: c[0][0])]
+    logger.info(f"Located {len(boards)} boards in image.")
+    return boards
+
+
+def outline_size(corners: np.ndarray) -> Tuple[float, float]:
+    """
+    :param corners: ordered board corners in px. See order_corners.
+
+    :return: mean width and height of board outline in px.
+    """
+    tl, tr, br, bl = corners
+    width = (np.linalg.norm(tr - tl) + np.linalg.norm(br - bl)) / 2
+    height = (np.linalg.norm(bl - tl) + np.linalg.norm(br - tr)) / 2
+    return float(width), float(height)
+
+
+def piece_spacing(
+    img: np.ndarray, params: DetectionParams = DEFAULT_PARAMS
+) -> Union[float, None]:
+    """
+    Estimate px between board lines from the distance of each piece to its closest
+    piece. Overestimates on sparse boards where few pieces are adjacent.
+
+    :param img: BGR or grayscale board image.
+    :param params: detection thresholds.
+
+    :return: median px from each piece to its closest piece. None if fewer than 2.
+    """
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    black_pieces, white_pieces = get_pieces(gray, params)
+    centers = np.array(
+        [piece.center for piece in [*black_pieces, *white_pieces]], dtype=np.float32
+    )
+    if len(centers) < 2:
+        return None
+
+    closest = np.empty(len(centers), dtype=np.float32)
+    # Chunk pairwise distances so large boards don't need a quadratic array at once.
+    for start in range(0, len(centers), 1024):
+        chunk = centers[start : start + 1024]
+        dists = np.linalg.norm(chunk[:, np.newaxis] - centers, axis=2)
+        dists[np.arange(len(chunk)), np.arange(start, start + len(chunk))] = np.inf
+        closest[start : start + len(chunk)] = dists.min(axis=1)
+    return float(np.median(closest))
+
+
+def canonical_size(
+    width: float,
+    height: float,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    size: int = ROI_SIZE,
+    spacing: Optional[float] = None,
+) -> Tuple[int, int]:
+    """
+    Size of canonical board image.
+
+    Standard boards are square and warped to size. Boards of unknown size keep the
+    aspect ratio of their outline and are only downscaled. Without a spacing, up to
+    MAX_FREE_LINES lines along each axis keep MIN_LINE_PX between lines. With one,
+    lines are scaled to MIN_LINE_PX apart, as detection is tuned for, but the longest
+    side isn't scaled below size.
+
+    :param width: px width of board.
+    :param height: px height of board.
+    :param board_dims: square board sizes to snap to. If None, board size is unknown.
+    :param size: side length in px of standard board image.
+    :param spacing: estimated px between board lines. See piece_spacing.
+
+    :return: px size of canonical board image. (width, height)
+    """
+    if board_dims is not None:
+        return size, size
+
+    longest = max(width, height)
+    scale = min(1.0, MIN_LINE_PX * MAX_FREE_LINES / longest)
+    if spacing is not None:
+        scale = min(scale, max(size / longest, MIN_LINE_PX / spacing))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def warp_board(
+    img: np.ndarray, corners: np.ndarray, size: Union[int, Tuple[int, int]] = ROI_SIZE
+) -> np.ndarray:
+    """
+    Warp board to a canonical image.
+
+    :param img: BGR or grayscale image.
+    :param corners: ordered board corners in px. See order_corners.
+    :param size: side length or (width, height) in px of output image.
+
+    :return: board image.
+    """
+    width, height = (size, size) if isinstance(size, int) else size
+    dst = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    transform = cv2.getPerspectiveTransform(corners, dst)
+    return cv2.warpPerspective(img, transform, (width, height), flags=cv2.INTER_AREA)
+
+
+def warp_canonical(
+    img: np.ndarray,
+    corners: np.ndarray,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: DetectionParams = DEFAULT_PARAMS,
+    size: int = ROI_SIZE,
+) -> np.ndarray:
+    """
+    Warp board to its canonical image. See canonical_size.
+
+    Boards of unknown size larger than size are warped twice. Once to estimate the
+    spacing of pieces and again to scale lines to MIN_LINE_PX apart.
+
+    :param img: BGR or grayscale image.
+    :param corners: ordered board corners in px. See order_corners.
+    :param board_dims: square board sizes to snap to. If None, board size is unknown.
+    :param params: detection thresholds used to estimate spacing.
+    :param size: side length in px of standard board image.
+
+    :return: board image.
+    """
+    roi_size = canonical_size(*outline_size(corners), board_dims, size)
+    roi = warp_board(img, corners, roi_size)
+    if board_dims is None and max(roi_size) > size:
+        spacing = piece_spacing(roi, params)
+        scaled_size = canonical_size(*roi_size, board_dims, size, spacing)
+        if scaled_size != roi_size:
+            roi = warp_board(img, corners, scaled_size)
+    return roi
+
+
+def crop_board(
+    img: np.ndarray,
+    size: int = ROI_SIZE,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: DetectionParams = DEFAULT_PARAMS,
+) -> np.ndarray:
+    """
+    Crop and warp image to a canonical image of the board. See canonical_size.
+
+    :param img: BGR or grayscale image.
+    :param size: side length in px of standard board image.
+    :param board_dims: square board sizes to snap to. If None, the board keeps the
+        aspect ratio of its outline and enough px per line.
+    :param params: detection thresholds used to estimate spacing of boards of
+        unknown size.
+
+    :return: board image. Unchanged if the image already only contains the board
+        and is no larger than size.
+    """
+    height, width = img.shape[:2]
+    corners = locate_board(img)
+
+    if corners is None:
+        if max(height, width) <= size:
+            return img
+        # Image is board. Only downscale.
+        corners = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+
+    return warp_canonical(img, corners, board_dims, params, size)
 
-    # Initialize board.
-    board = np.zeros((dim_x, dim_y))
-    board[:] = np.nan
+
+def place_pieces(
+    black_pieces: List[Piece],
+    white_pieces: List[Piece],
+    dims: Tuple[int, int],
+    x_map: Dict[float, int],
+    y_map: Dict[float, int],
+) -> np.ndarray:
+    """
+    Snap pieces to closest board position.
+
+    :param dims: board dimensions. (x, y)
+    :param x_map: mapping of x pixel positions of board lines to x board coordinates.
+    :param y_map: mapping of y pixel positions of board lines to y board coordinates.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    dim_x, dim_y = dims
+    # Initialize board. Rows are along y.
+    board = empty_grid(dim_y, dim_x)
 
     piece_counter = {"black": 0, "white": 0}
     for pieces in [black_pieces, white_pieces]:
         for piece in pieces:
-            symbol = 0.0 if piece.color == "white" else 1.0
+            symbol = WHITE if piece.color == "white" else BLACK
             piece_counter[piece.color] += 1
 
-            # Find closest board position based on
-            # abs(x_pos - median value of mapped x_pos) to board position.
-            x_diff = {x_pos: abs(x_px - piece.x_px) for x_px, x_pos in x_map.items()}
-            y_diff = {y_pos: abs(y_px - piece.y_px) for y_px, y_pos in y_map.items()}
+            # Find closest board line to center of piece.
+            cX, cY = piece.center
+            x_diff = {x_pos: abs(x_px - cX) for x_px, x_pos in x_map.items()}
+            y_diff = {y_pos: abs(y_px - cY) for y_px, y_pos in y_map.items()}
 
             x = min(x_diff, key=x_diff.get)
             y = min(y_diff, key=y_diff.get)
@@ -246,3 +754,216 @@ def load_board(img_path: str) -> np.ndarray:
     logger.info(f"Placed {sum(piece_counter.values())} pieces: {piece_counter}")
 
     return board
+
+
+def decode_image(data: ImageBuffer) -> np.ndarray:
+    """
+    Decode encoded image data (png, jpg, ...) directly from a buffer.
+
+    :param data: encoded image bytes or any object supporting the buffer protocol.
+
+    :return: decoded BGR image.
+    """
+    # View buffer as uint8 array without copying it.
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise Exception("Unable to decode image from buffer.")
+    return img
+
+
+def read_image(src: ImageSource) -> np.ndarray:
+    """
+    Read image from a path, encoded buffer, binary file-like, or decoded array.
+
+    :param src: image source.
+
+    :return: decoded image. Decoded arrays are returned as is.
+    """
+    if isinstance(src, np.ndarray):
+        return src
+    elif isinstance(src, (bytes, bytearray, memoryview)):
+        return decode_image(src)
+    elif hasattr(src, "read"):
+        # Use internal buffer of in-memory files (ex. io.BytesIO) to avoid a copy.
+        if hasattr(src, "getbuffer"):
+            return decode_image(src.getbuffer())
+        return decode_image(src.read())
+
+    if os.path.exists(src) is False:
+        raise Exception(f"Image, {src}, does not exist.")
+
+    img = cv2.imread(os.fspath(src))
+    if img is None:
+        raise Exception(f"Unable to read image, {src}.")
+    return img
+
+
+def read_encoded(src: ImageSource) -> Union[ImageBuffer, np.ndarray]:
+    """
+    Read encoded image data without decoding it.
+
+    :param src: image source.
+
+    :return: encoded image data. Decoded arrays and buffers are returned as is.
+    """
+    if isinstance(src, (np.ndarray, bytes, bytearray, memoryview)):
+        return src
+    elif hasattr(src, "read"):
+        return src.getbuffer() if hasattr(src, "getbuffer") else src.read()
+
+    if os.path.exists(src) is False:
+        raise Exception(f"Image, {src}, does not exist.")
+    return pathlib.Path(src).read_bytes()
+
+
+def _decode(src: ImageSource, metrics: Metrics) -> np.ndarray:
+    if isinstance(src, np.ndarray):
+        return src
+    with metrics.timer("decode"):
+        return read_image(src)
+
+
+def _recognize(
+    img: np.ndarray,
+    localize: bool,
+    metrics: Metrics,
+    board_dims: Optional[Sequence[int]],
+    params: DetectionParams,
+) -> Recognition:
+    if localize:
+        with metrics.timer("crop_board"):
+            img = crop_board(img, board_dims=board_dims, params=params)
+
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    with metrics.timer("get_pieces"):
+        black_pieces, white_pieces = get_pieces(gray, params)
+    metrics.count("contours", len(black_pieces) + len(white_pieces))
+
+    with metrics.timer("get_board_size"):
+        (dim_x, dim_y), x_map, y_map = get_board_size(
+            black_pieces, white_pieces, board_dims, params, gray.shape[1::-1]
+        )
+    logger.info(f"Estimated dimensions of board: (x: {dim_x}, y: {dim_y})")
+
+    with metrics.timer("place_pieces"):
+        grid = place_pieces(black_pieces, white_pieces, (dim_x, dim_y), x_map, y_map)
+
+    # Maps are ordered by px so positions are in order of board coordinate.
+    return Recognition(
+        grid=grid,
+        x_lattice=np.array(list(x_map), dtype=np.float32),
+        y_lattice=np.array(list(y_map), dtype=np.float32),
+    )
+
+
+def _load_source(
+    src: ImageSource,
+    localize: bool,
+    metrics: Metrics,
+    board_dims: Optional[Sequence[int]],
+    params: ParamsLike,
+    cache: Optional[RecognitionCache],
+) -> np.ndarray:
+    params = as_params(params)
+    if cache is None:
+        img = _decode(src, metrics)
+        return _recognize(img, localize, metrics, board_dims, params).grid
+
+    with metrics.timer("read"):
+        data = read_encoded(src)
+    with metrics.timer("cache_get"):
+        key = cache.key(
+            data,
+            {
+                **asdict(params),
+                "localize": localize,
+                "board_dims": board_dims,
+                "roi_size": ROI_SIZE,
+                "min_line_px": MIN_LINE_PX,
+                "max_free_lines": MAX_FREE_LINES,
+                "engine": ENGINE,
+            },
+        )
+        recognition = cache.get(key)
+
+    if recognition is not None:
+        metrics.count("cache_hits")
+        logger.info(f"Loaded recognized board from cache: {key}")
+        return recognition.grid
+
+    metrics.count("cache_misses")
+    img = _decode(data, metrics)
+    recognition = _recognize(img, localize, metrics, board_dims, params)
+    with metrics.timer("cache_put"):
+        cache.put(key, recognition)
+    return recognition.grid
+
+
+def load_board_from_array(
+    img: np.ndarray,
+    localize: bool = True,
+    metrics: Metrics = NULL_METRICS,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: ParamsLike = DEFAULT_PARAMS,
+    cache: Optional[RecognitionCache] = None,
+) -> np.ndarray:
+    """
+    Load board as np array from decoded image of goban.
+    :param img: BGR or grayscale image.
+    :param localize: locate and crop board before detecting pieces.
+    :param metrics: records time spent in each stage and number of contours.
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+    :param params: detection thresholds or name of saved profile.
+    :param cache: reuse results of previously recognized images with the same pixels.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    return _load_source(img, localize, metrics, board_dims, params, cache)
+
+
+def load_board_from_bytes(
+    data: Union[ImageBuffer, BinaryIO],
+    localize: bool = True,
+    metrics: Metrics = NULL_METRICS,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: ParamsLike = DEFAULT_PARAMS,
+    cache: Optional[RecognitionCache] = None,
+) -> np.ndarray:
+    """
+    Load board as np array from encoded image of goban.
+    :param data: encoded image bytes, buffer, or binary file-like.
+    :param localize: locate and crop board before detecting pieces.
+    :param metrics: records time spent in each stage and number of contours.
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+    :param params: detection thresholds or name of saved profile.
+    :param cache: reuse results of previously recognized images with the same bytes.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    logger.info("Initializing goban from encoded image.")
+    return _load_source(data, localize, metrics, board_dims, params, cache)
+
+
+def load_board(
+    img_path: ImageSource,
+    localize: bool = True,
+    metrics: Metrics = NULL_METRICS,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    params: ParamsLike = DEFAULT_PARAMS,
+    cache: Optional[RecognitionCache] = None,
+) -> np.ndarray:
+    """
+    Load board as np array from image of goban.
+    :param img_path: path to image. Encoded buffers, file-likes and arrays also accepted.
+    :param localize: locate and crop board before detecting pieces.
+    :param metrics: records time spent in each stage and number of contours.
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+    :param params: detection thresholds or name of saved profile.
+    :param cache: reuse results of previously recognized images with the same bytes.
+
+    :return: goban as int8 matrix where 0 is empty, 1 is black and 2 is white.
+    """
+    if isinstance(img_path, (str, os.PathLike)):
+        logger.info(f"Initializing goban from image: {img_path}")
+    return _load_source(img_path, localize, metrics, board_dims, params, cache)
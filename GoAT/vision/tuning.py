@@ -0,0 +1,323 @@
+"""
+Sweep detection parameters over labelled images and save the best as a profile.
+
+Each image is decoded and cropped once and shared with a pool of worker processes,
+which only receive parameter sets. The fastest parameter set that recognizes every
+image correctly, or with --best_effort the fewest wrong intersections, is saved as a
+named profile that load_board can load.
+
+Labels are grids (.npy, .txt or .sgf) with the same name as each image.
+
+Usage:
+    python -m GoAT.vision.tuning -i docs/images/9_9.png -l docs/labels -n rendered
+"""
+
+from __future__ import annotations
+import argparse
+import itertools
+import os
+import pathlib
+import sys
+import time
+import cv2
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from loguru import logger
+
+from GoAT.logic.formats import GRID_FORMATS, load_grid
+from GoAT.vision.loader import (
+    BOARD_DIMS,
+    DEFAULT_PARAMS,
+    PROFILE_DIR,
+    DetectionParams,
+    ImageSource,
+    crop_board,
+    load_board_from_array,
+    read_image,
+    save_profile,
+)
+
+# Values of each parameter to sweep. Includes defaults.
+PARAM_GRID: Dict[str, List[Any]] = {
+    "blur_size": [5, 7, 9, 11],
+    "black_threshold": [60, 80, 100, 120],
+    "white_threshold": [180, 200, 220],
+    "dist_ratio": [0.5, 0.6, 0.7, 0.8],
+    "cluster_gap": [3, 5, 8],
+}
+
+# Canonical grayscale board image and its labelled grid.
+LabelledImage = Tuple[np.ndarray, np.ndarray]
+
+# Images shared by all trials in a process. Set once per worker.
+_IMAGES: List[LabelledImage] = []
+_BOARD_DIMS: Optional[Sequence[int]] = BOARD_DIMS
+
+
+@dataclass
+class Trial:
+    params: DetectionParams
+    # Images recognized exactly.
+    n_correct: int = 0
+    # Intersections that differ from labels. All if board size is wrong.
+    n_wrong: int = 0
+    # Total secs to recognize all images.
+    secs: float = 0.0
+
+
+def _set_images(images: List[LabelledImage], board_dims: Optional[Sequence[int]]):
+    global _IMAGES, _BOARD_DIMS
+    _IMAGES = images
+    _BOARD_DIMS = board_dims
+
+
+def _init_worker(images: List[LabelledImage], board_dims: Optional[Sequence[int]]):
+    # Thousands of trials are too verbose to log.
+    logger.disable("GoAT")
+    _set_images(images, board_dims)
+
+
+def _evaluate(params: DetectionParams, repeat: int = 1) -> Trial:
+    """
+    Recognize every shared image with params. Runs in a worker process.
+
+    :param repeat: times to recognize each image. Fastest time is kept.
+    """
+    trial = Trial(params)
+    for img, label in _IMAGES:
+        secs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                grid = load_board_from_array(
+                    img, localize=False, board_dims=_BOARD_DIMS, params=params
+                )
+            except Exception:
+                grid = None
+            secs.append(time.perf_counter() - start)
+        trial.secs += min(secs)
+
+        if grid is not None and grid.shape == label.shape:
+            n_wrong = int(np.count_nonzero(grid != label))
+        else:
+            n_wrong = label.size
+        trial.n_wrong += n_wrong
+        trial.n_correct += n_wrong == 0
+    return trial
+
+
+def param_sets(grid: Dict[str, List[Any]] = PARAM_GRID) -> List[DetectionParams]:
+    """
+    :param grid: values of each parameter. Missing parameters use defaults.
+
+    :return: every valid combination of parameter values.
+    """
+    names = list(grid)
+    sets = []
+    for values in itertools.product(*grid.values()):
+        try:
+            sets.append(
+                DetectionParams(
+                    **{**asdict(DEFAULT_PARAMS), **dict(zip(names, values))}
+                )
+            )
+        except Exception:
+            # ex. black threshold above white threshold.
+            continue
+    return sets
+
+
+def find_label(
+    img_path: Union[str, os.PathLike],
+    label_dir: Optional[Union[str, os.PathLike]] = None,
+) -> pathlib.Path:
+    """
+    :param img_path: path to image.
+    :param label_dir: directory of labels. Defaults to directory of image.
+
+    :return: path to grid with same name as image.
+    """
+    img_path = pathlib.Path(img_path)
+    label_dir = img_path.parent if label_dir is None else pathlib.Path(label_dir)
+    for ext in GRID_FORMATS:
+        label_path = label_dir / f"{img_path.stem}{ext}"
+        if label_path.exists():
+            return label_path
+    raise Exception(
+        f"No label ({', '.join(GRID_FORMATS)}) for {img_path} in {label_dir}."
+    )
+
+
+def prepare_image(
+    src: ImageSource,
+    label: np.ndarray,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+) -> LabelledImage:
+    """
+    Decode and crop image once so trials only detect pieces.
+
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+
+    :return: canonical grayscale board image and label.
+    """
+    img = crop_board(read_image(src), board_dims=board_dims)
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return gray, label
+
+
+def sweep(
+    images: List[LabelledImage],
+    params: Optional[List[DetectionParams]] = None,
+    max_workers: Optional[int] = None,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+) -> List[Trial]:
+    """
+    Recognize every image with every parameter set.
+
+    :param images: canonical grayscale board images and labels. See prepare_image.
+    :param params: parameter sets to try. Defaults to every combination of PARAM_GRID.
+    :param max_workers: max worker processes. Trials run in this process if 1.
+    :param board_dims: square board sizes to snap to. If None, any M x N size is allowed.
+
+    :return: trial of each parameter set in same order.
+    """
+    params = param_sets() if params is None else params
+    if max_workers == 1:
+        _set_images(images, board_dims)
+        logger.disable("GoAT")
+        try:
+            return [_evaluate(param_set) for param_set in params]
+        finally:
+            logger.enable("GoAT")
+
+    n_workers = max_workers or os.cpu_count() or 1
+    # Images are sent once to each worker instead of with each trial.
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(images, board_dims)
+    ) as executor:
+        chunksize = max(1, len(params) // (n_workers * 4))
+        return list(executor.map(_evaluate, params, chunksize=chunksize))
+
+
+def best_trial(
+    images: List[LabelledImage],
+    trials: List[Trial],
+    n_finalists: int = 5,
+    repeat: int = 3,
+    board_dims: Optional[Sequence[int]] = BOARD_DIMS,
+    exact: bool = True,
+) -> Union[Trial, None]:
+    """
+    Pick fastest parameter set with the fewest wrong intersections.
+
+    Times from a sweep are noisy as workers compete for CPU so the fastest trials
+    with the fewest wrong intersections are timed again in this process.
+
+    :param n_finalists: number of fastest trials to time again.
+    :param repeat: times to recognize each image when timing again.
+    :param exact: only pick a parameter set that recognizes every image correctly.
+
+    :return: fastest trial with the fewest wrong intersections. None if no trials or
+        exact and no parameter set is correct.
+    """
+    if not trials:
+        return None
+
+    fewest_wrong = min(trial.n_wrong for trial in trials)
+    if exact and fewest_wrong != 0:
+        return None
+
+    closest = [trial for trial in trials if trial.n_wrong == fewest_wrong]
+    finalists = sorted(closest, key=lambda trial: trial.secs)[:n_finalists]
+    _set_images(images, board_dims)
+    logger.disable("GoAT")
+    try:
+        retimed = [_evaluate(trial.params, repeat=repeat) for trial in finalists]
+    finally:
+        logger.enable("GoAT")
+    return min(retimed, key=lambda trial: trial.secs)
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Tune detection parameters on labelled images and save a profile."
+    )
+    ap.add_argument("-i", "--images", nargs="+", required=True, help="Input images.")
+    ap.add_argument(
+        "-l",
+        "--labels",
+        type=str,
+        help="Directory of grids with same name as images. Defaults to image directory.",
+    )
+    ap.add_argument("-n", "--name", type=str, required=True, help="Profile name.")
+    ap.add_argument(
+        "-d", "--profile_dir", type=str, default=PROFILE_DIR, help="Profile directory."
+    )
+    ap.add_argument("-w", "--workers", type=int, help="Max worker processes.")
+    ap.add_argument(
+        "-f",
+        "--free_size",
+        action="store_true",
+        help="Estimate any M x N board size instead of 5, 9, 13 or 19.",
+    )
+    ap.add_argument(
+        "-b",
+        "--best_effort",
+        action="store_true",
+        help="Save parameter set with fewest wrong intersections if none is exact.",
+    )
+    args = ap.parse_args()
+
+    board_dims = None if args.free_size else BOARD_DIMS
+    images = [
+        prepare_image(
+            img_path, load_grid(find_label(img_path, args.labels))[0], board_dims
+        )
+        for img_path in args.images
+    ]
+
+    params = param_sets()
+    start = time.perf_counter()
+    trials = sweep(images, params, max_workers=args.workers, board_dims=board_dims)
+    print(
+        f"Tried {len(trials)} parameter sets on {len(images)} images"
+        f" in {time.perf_counter() - start:.1f} secs.",
+        file=sys.stderr,
+    )
+
+    default = trials[params.index(DEFAULT_PARAMS)]
+    print(
+        f"Default: {default.n_correct}/{len(images)} correct,"
+        f" {default.n_wrong} wrong intersections"
+        f" ({default.secs / len(images) * 1000:.1f} ms/image).",
+        file=sys.stderr,
+    )
+
+    best = best_trial(images, trials, board_dims=board_dims, exact=not args.best_effort)
+    if best is None:
+        closest = min(trials, key=lambda trial: (trial.n_wrong, trial.secs))
+        print(
+            f"No parameter set recognizes every image. Closest has {closest.n_wrong}"
+            f" wrong intersections: {closest.params}"
+        )
+        sys.exit(1)
+
+    save_profile(
+        args.name,
+        best.params,
+        args.profile_dir,
+        images=[pathlib.Path(img_path).name for img_path in args.images],
+        secs_per_image=best.secs / len(images),
+        n_wrong=best.n_wrong,
+    )
+    print(
+        f"Saved {args.name}: {best.params} ({best.secs / len(images) * 1000:.1f} ms/image,"
+        f" {best.n_correct}/{len(images)} correct, {best.n_wrong} wrong intersections)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Benchmark each stage of the GoAT pipeline on docs/images fixtures and synthetic grids.
+
+Usage:
+    python -m benchmarks.pipeline -o baseline.json
+    python -m benchmarks.pipeline --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import platform
+import signal
+import statistics
+import sys
+import time
+import bidict
+import cv2
+import numpy as np
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from loguru import logger
+
+from GoAT.logic.board import Board
+from GoAT.logic.encoding import BLACK, COLORS, EMPTY, GRID_DTYPE, WHITE, empty_grid
+from GoAT.logic.scoring import Score
+from GoAT.vision.loader import (
+    crop_board,
+    decode_image,
+    get_board_size,
+    get_pieces,
+    load_board,
+    place_pieces,
+)
+
+BOARD_SIZES = [5, 9, 13, 19]
+IMAGE_DIR = pathlib.Path(__file__).parents[1].joinpath("docs", "images")
+
+
+def random_grid(size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate grid with random stones. 40% empty, 30% black and 30% white.
+    """
+    return rng.choice(
+        np.array([EMPTY, BLACK, WHITE], dtype=GRID_DTYPE),
+        size=(size, size),
+        p=[0.4, 0.3, 0.3],
+    )
+
+
+def endgame_grid(size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate finished grid with a wall between black and white territory and
+    a few dead stones in each territory.
+    """
+    grid = empty_grid(size, size)
+
+    # Black territory to the left of a wandering wall and white to the right.
+    split = size // 2 - 1
+    for row in range(size):
+        split = int(np.clip(split + rng.integers(-1, 2), 1, size - 4))
+        grid[row, split] = BLACK
+        grid[row, split + 1] = WHITE
+
+    # Capture invading stones on opposite edges.
+    for _ in range(max(1, size // 5)):
+        row = int(rng.integers(1, size - 1))
+        for col, own, invader in [(0, BLACK, WHITE), (size - 1, WHITE, BLACK)]:
+            inner_col = 1 if col == 0 else size - 2
+            edge = grid[row - 1 : row + 2, col]
+            if (edge != EMPTY).any() or grid[row, inner_col] != EMPTY:
+                continue
+            grid[row, col] = invader
+            grid[row - 1, col] = grid[row + 1, col] = grid[row, inner_col] = own
+
+    return grid
+
+
+def new_board(grid: np.ndarray) -> Board:
+    return Board(
+        grid=grid.copy(),
+        captures=Counter({"Black": 0, "White": 0}),
+        colors=bidict.bidict(COLORS),
+    )
+
+
+class StageTimeout(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def stage_timeout(secs: float):
+    """
+    Raise StageTimeout if block runs longer than secs. No-op where SIGALRM is unavailable.
+    """
+    if not secs or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def _raise(signum, frame):
+        raise StageTimeout()
+
+    prev_handler = signal.signal(signal.SIGALRM, _raise)
+    signal.setitimer(signal.ITIMER_REAL, secs)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev_handler)
+
+
+def time_stage(
+    func: Callable[[Any], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = 5,
+    budget: float = 2.0,
+    timeout: float = 30.0,
+) -> Dict[str, float]:
+    """
+    Time func, excluding untimed setup, up to repeat times or until budget secs elapse.
+
+    :param func: function to time. Given output of setup.
+    :param setup: function run before each call of func.
+    :param timeout: max secs for a single setup and call of func.
+
+    :return: timings in secs. Only number of runs and timeout if a run timed out.
+    """
+    times = []
+    while len(times) < repeat:
+        try:
+            with stage_timeout(timeout):
+                state = setup() if setup else None
+                start = time.perf_counter()
+                func(state)
+                times.append(time.perf_counter() - start)
+        except StageTimeout:
+            return {"n": len(times), "timeout": timeout}
+        if sum(times) > budget:
+            break
+
+    return {
+        "n": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def image_stages(
+    img_path: pathlib.Path,
+) -> Iterator[Tuple[str, Callable, Optional[Callable]]]:
+    data = img_path.read_bytes()
+    img = decode_image(data)
+    roi = crop_board(img)
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    black, white = get_pieces(gray)
+    dims, x_map, y_map = get_board_size(black, white)
+
+    yield "decode", lambda _: decode_image(data), None
+    yield "crop_board", lambda _: crop_board(img), None
+    yield "get_pieces", lambda _: get_pieces(gray), None
+    yield "get_board_size", lambda _: get_board_size(black, white), None
+    yield "place_pieces", lambda _: place_pieces(black, white, dims, x_map, y_map), None
+
+
+def _regions_board(grid: np.ndarray) -> Board:
+    board = new_board(grid)
+    board._get_regions()
+    return board
+
+
+def _cleared_board(grid: np.ndarray) -> Board:
+    return new_board(grid).clear_dead_regions()
+
+
+def board_stages(
+    grid: np.ndarray, max_seki_size: int
+) -> Iterator[Tuple[str, Callable, Optional[Callable]]]:
+    yield "Board", lambda _: new_board(grid), None
+    yield "_get_regions", lambda b: b._get_regions(), lambda: new_board(grid)
+    yield "_join_nearby_regions", lambda b: b._join_nearby_regions(), lambda: (
+        _regions_board(grid)
+    )
+    yield "_update_graph", lambda b: b._update_graph(), lambda: new_board(grid)
+    yield "clear_dead_regions", lambda b: b.clear_dead_regions(), lambda: new_board(
+        grid
+    )
+    # Seki detection rebuilds all regions twice per empty point.
+    if max(grid.shape) <= max_seki_size:
+        yield "_update_seki", lambda b: b._update_seki(), lambda: _cleared_board(grid)
+    for system in ["Chinese", "Japanese"]:
+        yield f"Score.score[{system}]", lambda args: args[0].score(args[1]), (
+            lambda system=system: (Score(system, komi=True), _cleared_board(grid))
+        )
+
+
+def cases(
+    img_paths: List[pathlib.Path], sizes: List[int], seed: int
+) -> Iterator[Tuple[str, Optional[pathlib.Path], Callable[[], np.ndarray]]]:
+    for img_path in img_paths:
+        yield f"image:{img_path.name}", img_path, lambda p=img_path: load_board(p)
+    for size in sizes:
+        for i, (name, generator) in enumerate(
+            [("random", random_grid), ("endgame", endgame_grid)]
+        ):
+            # Seed per case so adding cases doesn't change grids of others.
+            rng = np.random.default_rng([seed, size, i])
+            grid = generator(size, rng)
+            yield f"{name}:{size}x{size}", None, lambda g=grid: g
+
+
+def run(
+    img_paths: List[pathlib.Path],
+    sizes: List[int],
+    seed: int = 0,
+    repeat: int = 5,
+    budget: float = 2.0,
+    max_seki_size: int = 19,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Run benchmarks.
+
+    :return: benchmark metadata and timings keyed by "{case}/{stage}".
+    """
+    results = {}
+    for case, img_path, get_grid in cases(img_paths, sizes, seed):
+        stages = []
+        try:
+            if img_path:
+                stages.extend(image_stages(img_path))
+            stages.extend(board_stages(get_grid(), max_seki_size))
+        except Exception as err:
+            print(f"{case}: skipped. {err}", file=sys.stderr)
+            continue
+
+        board_timeout = False
+        for stage, func, setup in stages:
+            key = f"{case}/{stage}"
+            # Remaining stages all construct a Board so would also time out.
+            if board_timeout:
+                results[key] = {"n": 0, "timeout": timeout}
+            else:
+                results[key] = time_stage(
+                    func, setup, repeat=repeat, budget=budget, timeout=timeout
+                )
+                board_timeout = stage == "Board" and "timeout" in results[key]
+
+            if "timeout" in results[key]:
+                timing = f"{'timeout':>12}"
+            else:
+                timing = f"{results[key]['median'] * 1000:>12.3f} ms"
+            print(f"{key:<50} {timing}", file=sys.stderr, flush=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "seed": seed,
+            "repeat": repeat,
+            "timeout": timeout,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Compare median timings against a baseline.
+
+    :param threshold: allowed fractional slowdown. ex. 0.25 allows 25% slower.
+
+    :return: keys of regressed stages.
+    """
+    regressions = []
+    for key, timing in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        # Treat timeouts as infinitely slow.
+        base_median = baseline["results"][key].get("median", float("inf"))
+        median = timing.get("median", float("inf"))
+        if median == base_median:
+            ratio = 1.0
+        else:
+            ratio = median / base_median if base_median else float("inf")
+        status = "REGRESSED" if ratio > 1 + threshold else "ok"
+        if status == "REGRESSED":
+            regressions.append(key)
+        print(f"{key:<50} {ratio:>8.2f}x {status}")
+
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark GoAT pipeline stages.")
+    ap.add_argument(
+        "-i",
+        "--images",
+        type=pathlib.Path,
+        nargs="*",
+        default=sorted(IMAGE_DIR.glob("*.*")),
+        help="Image fixtures. Defaults to docs/images.",
+    )
+    ap.add_argument(
+        "--sizes", type=int, nargs="*", default=BOARD_SIZES, help="Synthetic sizes."
+    )
+    ap.add_argument("--seed", type=int, default=0, help="Seed for synthetic grids.")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Runs per stage.")
+    ap.add_argument(
+        "--budget", type=float, default=2.0, help="Max secs spent per stage."
+    )
+    ap.add_argument(
+        "--max_seki_size",
+        type=int,
+        default=19,
+        help="Largest board size to benchmark _update_seki on. Runs are cut off by --timeout.",
+    )
+    ap.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Max secs for a single run of a stage before it is recorded as timed out.",
+    )
+    ap.add_argument("-o", "--output", type=pathlib.Path, help="Save results as JSON.")
+    ap.add_argument("-c", "--compare", type=pathlib.Path, help="Baseline JSON.")
+    ap.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed fractional slowdown from baseline before failing.",
+    )
+    args = ap.parse_args()
+
+    # Exclude logging and printing of scores from timings. Progress is on stderr.
+    logger.disable("GoAT")
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run(
+            args.images,
+            args.sizes,
+            seed=args.seed,
+            repeat=args.repeat,
+            budget=args.budget,
+            max_seki_size=args.max_seki_size,
+            timeout=args.timeout,
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"{len(regressions)} stages regressed by more than {args.threshold:.0%}."
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Measure how scoring time grows with board size, from 5x5 up to 51x51.
+
+Each size is scored end-to-end (Board, clear_dead_regions and Score) on seeded random
+and endgame grids. The growth exponent is the slope of log(time) against
+log(intersections), so 1.0 is linear in the number of intersections.
+
+Usage:
+    python -m benchmarks.scaling --max_exponent 1.5 -o scaling.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import sys
+import numpy as np
+
+from typing import Any, Dict, List
+from loguru import logger
+
+from GoAT.logic.scoring import Score
+from benchmarks.pipeline import endgame_grid, new_board, random_grid, time_stage
+
+SCALING_SIZES = [5, 9, 13, 19, 25, 31, 37, 43, 51]
+
+
+def score_grid(grid: np.ndarray):
+    board = new_board(grid).clear_dead_regions()
+    Score("Chinese", komi=True).score(board)
+
+
+def growth_exponent(sizes: List[int], times: List[float]) -> float:
+    """
+    :return: slope of log(time) against log(intersections) of square boards.
+    """
+    n_intersections = np.array(sizes, dtype=float) ** 2
+    slope, _ = np.polyfit(np.log(n_intersections), np.log(times), 1)
+    return float(slope)
+
+
+def run(
+    sizes: List[int],
+    seed: int = 0,
+    repeat: int = 5,
+    budget: float = 2.0,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Run benchmarks.
+
+    :return: timings keyed by "{case}:{size}x{size}" and growth exponent of each case.
+    """
+    results = {}
+    exponents = {}
+    for i, (name, generator) in enumerate(
+        [("random", random_grid), ("endgame", endgame_grid)]
+    ):
+        medians = []
+        for size in sizes:
+            # Same seeding as benchmarks.pipeline so grids match across benchmarks.
+            grid = generator(size, np.random.default_rng([seed, size, i]))
+            key = f"{name}:{size}x{size}"
+            results[key] = time_stage(
+                lambda _: score_grid(grid),
+                repeat=repeat,
+                budget=budget,
+                timeout=timeout,
+            )
+            if "timeout" in results[key]:
+                print(f"{key:<20} {'timeout':>12}", file=sys.stderr, flush=True)
+                continue
+
+            median = results[key]["median"]
+            medians.append((size, median))
+            print(
+                f"{key:<20} {median * 1000:>12.3f} ms"
+                f" {median / size**2 * 1e6:>10.2f} us/intersection",
+                file=sys.stderr,
+                flush=True,
+            )
+
+        if len(medians) > 1:
+            exponents[name] = growth_exponent(*zip(*medians))
+            print(f"{name} growth exponent: {exponents[name]:.2f}", file=sys.stderr)
+
+    return {
+        "meta": {"seed": seed, "repeat": repeat, "timeout": timeout},
+        "results": results,
+        "exponents": exponents,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark scoring time by board size.")
+    ap.add_argument(
+        "--sizes", type=int, nargs="*", default=SCALING_SIZES, help="Board sizes."
+    )
+    ap.add_argument("--seed", type=int, default=0, help="Seed for synthetic grids.")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Runs per size.")
+    ap.add_argument("--budget", type=float, default=2.0, help="Max secs per size.")
+    ap.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Max secs for a single run before it is recorded as timed out.",
+    )
+    ap.add_argument(
+        "--max_exponent",
+        type=float,
+        default=1.5,
+        help="Max growth exponent of time with number of intersections before failing.",
+    )
+    ap.add_argument("-o", "--output", type=pathlib.Path, help="Save results as JSON.")
+    args = ap.parse_args()
+
+    # Exclude logging and printing of scores from timings. Progress is on stderr.
+    logger.disable("GoAT")
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run(
+            args.sizes,
+            seed=args.seed,
+            repeat=args.repeat,
+            budget=args.budget,
+            timeout=args.timeout,
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    n_timeouts = sum("timeout" in timing for timing in results["results"].values())
+    failed = [
+        name
+        for name, exponent in results["exponents"].items()
+        if exponent > args.max_exponent
+    ]
+    if failed or n_timeouts:
+        print(
+            f"Scoring grows faster than intersections^{args.max_exponent} for {failed}"
+            f" or timed out on {n_timeouts} sizes."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure startup time of scoring a grid with main.py.
+
+The grid path must not import OpenCV or igraph. Its target is set relative to the
+time to import its unavoidable dependencies (numpy and loguru) so it holds across
+machines.
+
+Usage:
+    python -m benchmarks.startup --max_overhead 0.1
+"""
+
+import argparse
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+from typing import List
+
+REPO_DIR = pathlib.Path(__file__).parents[1]
+HEAVY_MODULES = ["cv2", "imutils", "igraph"]
+
+# Score grid in-process and report which heavy modules were imported.
+CHECK_IMPORTS = """
+import sys
+sys.argv = ["main.py", "-i", sys.argv[1], "-s", "Chinese"]
+import main
+main.main()
+print("imported:" + ",".join(mod for mod in {modules} if mod in sys.modules))
+"""
+
+
+def time_command(cmd: List[str], repeat: int) -> float:
+    """
+    :return: median wall time in secs of running cmd.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=REPO_DIR, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark grid scoring startup time.")
+    ap.add_argument("-r", "--repeat", type=int, default=10, help="Runs per command.")
+    ap.add_argument(
+        "--max_overhead",
+        type=float,
+        default=0.1,
+        help="Max secs the grid path may take over importing numpy and loguru.",
+    )
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        grid_path = pathlib.Path(tmp_dir).joinpath("grid.npy")
+        # Small board so scoring time doesn't mask startup time.
+        grid = np.zeros((5, 5), dtype=np.int8)
+        grid[:, 1] = 1
+        grid[:, 2] = 2
+        np.save(grid_path, grid)
+
+        check = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                CHECK_IMPORTS.format(modules=HEAVY_MODULES),
+                str(grid_path),
+            ],
+            cwd=REPO_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        heavy_imports = check.stdout.rpartition("imported:")[2].strip()
+
+        floor = time_command(
+            [sys.executable, "-c", "import numpy, loguru"], args.repeat
+        )
+        grid_time = time_command(
+            [sys.executable, "main.py", "-i", str(grid_path), "-s", "Chinese"],
+            args.repeat,
+        )
+    image_time = time_command(
+        [sys.executable, "main.py", "-i", "docs/images/5_5.png", "-s", "Chinese"],
+        args.repeat,
+    )
+
+    overhead = grid_time - floor
+    print(f"{'import numpy, loguru':<30} {floor * 1000:>10.1f} ms")
+    print(f"{'main.py grid (.npy)':<30} {grid_time * 1000:>10.1f} ms")
+    print(f"{'main.py image (.png)':<30} {image_time * 1000:>10.1f} ms")
+    print(f"{'grid overhead':<30} {overhead * 1000:>10.1f} ms")
+
+    failed = False
+    if heavy_imports:
+        print(f"Grid path imported: {heavy_imports}")
+        failed = True
+    if overhead > args.max_overhead:
+        print(
+            f"Grid path overhead exceeds target of {args.max_overhead * 1000:.0f} ms."
+        )
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,25 @@
 import argparse
 import pathlib
-import bidict
+import sys
 from collections import Counter
 from loguru import logger
 
-from GoAT.logic.board import Board
-from GoAT.logic.scoring import Score
-from GoAT.vision.loader import load_board
+# Heavy imports (numpy, OpenCV, ...) are deferred until needed.
+# Grid inputs never import OpenCV.
+from GoAT.logic import GRID_FORMATS
 
 
 def main():
-    ap = argparse.ArgumentParser(description="Calculate score from a Go board image.")
-    ap.add_argument("-i", "--input", type=str, required=True, help="Input image.")
+    ap = argparse.ArgumentParser(
+        description="Calculate score from a Go board image or grid."
+    )
+    ap.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        required=True,
+        help=f"Input image or grid ({', '.join(GRID_FORMATS)}).",
+    )
     ap.add_argument("-s", "--scoring", type=str, required=True, help="Scoring method.")
     ap.add_argument("-k", "--komi", action="store_true", help="Apply komi.")
     ap.add_argument(
@@ -30,6 +38,71 @@ def main():
         default=0,
         help="Captured white stones by black.",
     )
+    ap.add_argument(
+        "-f",
+        "--free_size",
+        action="store_true",
+        required=False,
+        help="Estimate any M x N board size from images instead of 5, 9, 13 or 19.",
+    )
+    ap.add_argument(
+        "-pr",
+        "--params",
+        type=str,
+        required=False,
+        help="Detection profile saved by GoAT.vision.tuning. Name or path to .json.",
+    )
+    ap.add_argument(
+        "-c",
+        "--cache",
+        type=str,
+        required=False,
+        help="Cache directory. Reuses boards recognized from images with the same bytes.",
+    )
+    ap.add_argument(
+        "-cs",
+        "--cache_size",
+        type=int,
+        required=False,
+        default=256,
+        help="Max size of cache in MiB before least recently used boards are evicted.",
+    )
+    ap.add_argument(
+        "-mb",
+        "--multi",
+        action="store_true",
+        required=False,
+        help="Score every board in image.",
+    )
+    ap.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        required=False,
+        help="Max worker processes to score boards with --multi. Defaults to CPU count.",
+    )
+    ap.add_argument(
+        "-m",
+        "--metrics",
+        type=str,
+        choices=["json", "prometheus"],
+        required=False,
+        help="Output per-stage timings and counts in given format.",
+    )
+    ap.add_argument(
+        "-mo",
+        "--metrics_out",
+        type=str,
+        required=False,
+        help="Write metrics to file instead of stdout. Requires --metrics.",
+    )
+    ap.add_argument(
+        "-p",
+        "--profile",
+        type=str,
+        required=False,
+        help="Write cProfile stats of run to file.",
+    )
 
     # Setup logger.
     working_dir = pathlib.Path(__file__).parents[0]
@@ -41,24 +114,107 @@ def main():
     logger.configure(handlers=[main_log])
 
     args = vars(ap.parse_args())
-    grid = load_board(args["input"])
+    if args["metrics_out"] and not args["metrics"]:
+        ap.error("--metrics_out requires --metrics.")
+    is_grid = pathlib.Path(args["input"]).suffix.lower() in GRID_FORMATS
+    if args["multi"]:
+        # Options that only apply to a single board.
+        if is_grid:
+            ap.error("--multi only supports images.")
+        if args["cache"]:
+            ap.error("--cache is not supported with --multi.")
+        if args["cap_blk"] or args["cap_wht"]:
+            ap.error("--cap_blk and --cap_wht are not supported with --multi.")
+
+    profiler = None
+    if args["profile"]:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    import bidict
+    from GoAT.metrics import Metrics, NULL_METRICS
+    from GoAT.logic.board import Board
+    from GoAT.logic.scoring import Score
+    from GoAT.logic.encoding import COLORS
+
+    metrics = Metrics() if args["metrics"] else NULL_METRICS
 
     # Add additional captured pieces if provided.
     # Otherwise, assume no pieces removed from board.
     captured_pieces = Counter({"Black": args["cap_blk"], "White": args["cap_wht"]})
 
-    scoreboard = Score(args["scoring"], komi=args["komi"])
-    board = Board(
-        grid=grid,
-        captures=captured_pieces,
-        colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
-    )
+    if args["multi"]:
+        from GoAT.vision.frame import score_frame
+        from GoAT.vision.loader import BOARD_DIMS, DEFAULT_PARAMS
+
+        results = score_frame(
+            args["input"],
+            args["scoring"],
+            komi=args["komi"],
+            max_workers=args["workers"],
+            board_dims=None if args["free_size"] else BOARD_DIMS,
+            params=args["params"] or DEFAULT_PARAMS,
+            metrics=metrics,
+        )
+        for i, result in enumerate(results, 1):
+            print(
+                f"Board {i} at (x, y, w, h) {result.bbox}: {result.error or result.scores}"
+            )
+    else:
+        if is_grid:
+            from GoAT.logic.formats import load_grid
+
+            with metrics.timer("load_grid"):
+                grid, recorded_captures = load_grid(args["input"])
+            captured_pieces.update(recorded_captures)
+        else:
+            from GoAT.vision.cache import RecognitionCache
+            from GoAT.vision.loader import BOARD_DIMS, DEFAULT_PARAMS, load_board
+
+            cache = None
+            if args["cache"]:
+                cache = RecognitionCache(args["cache"], args["cache_size"] * 2**20)
+
+            grid = load_board(
+                args["input"],
+                metrics=metrics,
+                board_dims=None if args["free_size"] else BOARD_DIMS,
+                params=args["params"] or DEFAULT_PARAMS,
+                cache=cache,
+            )
+
+        scoreboard = Score(args["scoring"], komi=args["komi"])
+        board = Board(
+            grid=grid,
+            captures=captured_pieces,
+            colors=bidict.bidict(COLORS),
+            metrics=metrics,
+        )
+
+        # Permanently clear dead regions and update captures.
+        board.clear_dead_regions()
+
+        # Score board and declare score. Metrics of board include recognition.
+        scoreboard.score(board)
+        metrics = scoreboard.metrics
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args["profile"])
+        logger.info(f"Saved profile to {args['profile']}")
 
-    # Permanently clear dead regions and update captures.
-    board.clear_dead_regions()
+    if args["metrics"]:
+        if args["metrics"] == "json":
+            output = metrics.to_json() + "\n"
+        else:
+            output = metrics.to_prometheus()
 
-    # Score board and declare score.
-    scoreboard.score(board)
+        if args["metrics_out"]:
+            pathlib.Path(args["metrics_out"]).write_text(output)
+        else:
+            sys.stdout.write(output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+import pathlib
+import tempfile
+import unittest
+import numpy as np
+from collections import Counter
+
+from GoAT.logic.archive import ArchiveReader, ArchiveWriter, pack_grids, unpack_grids
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 19 x 19 isn't a multiple of 4 intersections so last byte is padded.
+        self.grids = rng.integers(0, 3, size=(10, 19, 19), dtype=np.int8)
+        self.captures = rng.integers(0, 100, size=(10, 2))
+        self.source_ids = np.arange(10) + 2**40
+
+    def test_pack_unpack(self):
+        packed = pack_grids(self.grids)
+        self.assertEqual(packed.shape, (10, 91))
+        np.testing.assert_array_equal(unpack_grids(packed, 19), self.grids)
+
+    def test_pack_float(self):
+        # Legacy encoding where 1.0 is black, 0.0 is white and NaN is empty.
+        grids = np.array([[[1.0, 0.0], [np.nan, 0.0]]])
+        np.testing.assert_array_equal(
+            unpack_grids(pack_grids(grids), 2), [[[1, 2], [0, 2]]]
+        )
+
+    def test_pack_invalid(self):
+        with self.assertRaises(Exception):
+            pack_grids(np.array([[[0, 2], [4, 1]]], dtype=np.int8))
+        with self.assertRaises(Exception):
+            pack_grids(np.array([[[0.5, 1.0]]]))
+
+    def test_write_read(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("boards.goat")
+            with ArchiveWriter(path, size=19) as writer:
+                writer.write_batch(
+                    self.grids[:6], self.captures[:6], self.source_ids[:6]
+                )
+            # Reopen and append.
+            with ArchiveWriter(path, size=19) as writer:
+                for grid, (n_blk, n_wht), source_id in zip(
+                    self.grids[6:], self.captures[6:], self.source_ids[6:]
+                ):
+                    writer.write(
+                        grid, Counter({"Black": n_blk, "White": n_wht}), source_id
+                    )
+
+            reader = ArchiveReader(path)
+            self.assertEqual((reader.shape, len(reader)), ((19, 19), 10))
+
+            grids, captures, source_ids = reader.read()
+            np.testing.assert_array_equal(grids, self.grids)
+            np.testing.assert_array_equal(captures, self.captures)
+            np.testing.assert_array_equal(source_ids, self.source_ids)
+
+            grid, captures, source_id = reader[7]
+            np.testing.assert_array_equal(grid, self.grids[7])
+            self.assertEqual(
+                captures,
+                Counter({"Black": self.captures[7, 0], "White": self.captures[7, 1]}),
+            )
+            self.assertEqual(source_id, self.source_ids[7])
+
+            # Splitting archive covers every board once.
+            parts = reader.partition(3)
+            self.assertEqual(parts, [(0, 3), (3, 6), (6, 10)])
+            batches = [
+                batch
+                for start, stop in parts
+                for batch in reader.batches(batch_size=2, start=start, stop=stop)
+            ]
+            self.assertEqual(
+                [len(grids) for grids, _, _ in batches], [2, 1, 2, 1, 2, 2]
+            )
+            np.testing.assert_array_equal(
+                np.concatenate([grids for grids, _, _ in batches]), self.grids
+            )
+
+            with self.assertRaises(Exception):
+                ArchiveWriter(path, size=9)
+
+    def test_append_partial_record(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("boards.goat")
+            with ArchiveWriter(path, size=19) as writer:
+                writer.write_batch(
+                    self.grids[:2], self.captures[:2], self.source_ids[:2]
+                )
+            # Writer crashed mid-write.
+            with open(path, "ab") as fh:
+                fh.write(b"\x01\x02\x03")
+
+            with ArchiveWriter(path, size=19) as writer:
+                writer.write(self.grids[2], Counter({"Black": 3, "White": 4}), 7)
+
+            reader = ArchiveReader(path)
+            self.assertEqual(len(reader), 3)
+            grid, captures, source_id = reader[2]
+            np.testing.assert_array_equal(grid, self.grids[2])
+            self.assertEqual(captures, Counter({"Black": 3, "White": 4}))
+            self.assertEqual(source_id, 7)
+
+    def test_write_out_of_range(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("boards.goat")
+            with ArchiveWriter(path, size=19) as writer:
+                for captures, source_id in [
+                    ([[65536, 0]], [0]),
+                    ([[-1, 0]], [0]),
+                    ([[0, 0]], [-1]),
+                    ([[0, 0]], [2**64]),
+                ]:
+                    with self.assertRaises(Exception):
+                        writer.write_batch(self.grids[:1], captures, source_id)
+            self.assertEqual(len(ArchiveReader(path)), 0)
+
+    def test_rectangular(self):
+        grids = self.grids[:, :7, :]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("boards.goat")
+            with ArchiveWriter(path, size=(7, 19)) as writer:
+                writer.write_batch(grids, self.captures, self.source_ids)
+
+            reader = ArchiveReader(path)
+            self.assertEqual(reader.shape, (7, 19))
+            np.testing.assert_array_equal(reader.read()[0], grids)
+
+    def test_invalid_archive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir).joinpath("boards.goat")
+            path.write_bytes(b"not an archive")
+            with self.assertRaises(Exception):
+                ArchiveReader(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+
+from benchmarks.pipeline import compare, endgame_grid, random_grid, time_stage
+from benchmarks.scaling import growth_exponent
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_synthetic_grids_seeded(self):
+        for generator in [random_grid, endgame_grid]:
+            grid_1 = generator(9, np.random.default_rng(0))
+            grid_2 = generator(9, np.random.default_rng(0))
+            self.assertEqual(grid_1.shape, (9, 9))
+            np.testing.assert_array_equal(grid_1, grid_2)
+
+    def test_time_stage(self):
+        timing = time_stage(lambda state: state + 1, lambda: 1, repeat=3)
+        self.assertEqual(timing["n"], 3)
+        self.assertLessEqual(timing["min"], timing["median"])
+
+    def test_growth_exponent(self):
+        # Time doubles with intersections. ie. linear.
+        self.assertAlmostEqual(growth_exponent([5, 10, 20], [1.0, 4.0, 16.0]), 1.0)
+
+    def test_compare(self):
+        baseline = {
+            "results": {
+                "a/stage": {"median": 1.0},
+                "b/stage": {"median": 1.0},
+                "c/stage": {"n": 0, "timeout": 10.0},
+            }
+        }
+        current = {
+            "results": {
+                "a/stage": {"median": 1.1},
+                "b/stage": {"median": 2.0},
+                "c/stage": {"median": 2.0},
+                "d/stage": {"median": 2.0},
+            }
+        }
+        self.assertEqual(compare(current, baseline, threshold=0.25), ["b/stage"])
@@ -0,0 +1,74 @@
+import unittest
+import bidict
+import numpy as np
+from collections import Counter
+
+from GoAT.logic.board import Board
+from GoAT.logic.encoding import BLACK, COLORS, EMPTY, WHITE
+from GoAT.logic.formats import parse_diagram
+from GoAT.logic.scoring import Score
+
+
+def new_board(grid: np.ndarray) -> Board:
+    return Board(
+        grid=grid,
+        captures=Counter({"Black": 0, "White": 0}),
+        colors=bidict.bidict(COLORS),
+    )
+
+
+class TestBoard(unittest.TestCase):
+    def test_rectangular(self):
+        # Black owns left 2 columns and white owns right 3 columns.
+        board = new_board(parse_diagram("..XO...\n" * 3))
+        self.assertEqual((board.n_rows, board.n_cols), (3, 7))
+        self.assertEqual(board.region_counts, Counter({EMPTY: 2, BLACK: 1, WHITE: 1}))
+
+        scores = Score("Chinese", komi=False).score(board.clear_dead_regions())
+        self.assertEqual(scores, Counter({"Black": 9, "White": 12}))
+
+    def test_join_regions(self):
+        # White stones share liberty at centre and are joined into one region.
+        board = new_board(parse_diagram("X.X/.../O.O"))
+        self.assertEqual(board.region_counts, Counter({BLACK: 1, WHITE: 1, EMPTY: 1}))
+        self.assertEqual(len(board.region_edges), 4)
+
+    def test_unconditional_life(self):
+        # Black has two eyes. One holds a dead white stone.
+        board = new_board(parse_diagram(".OX.X/XXXXX/OOOOO/...../....."))
+        alive = {region.color_val for region in board.regions if region.is_alive}
+        self.assertEqual(alive, {BLACK})
+        self.assertEqual(board.safe_territory["Black"], {(0, 0), (0, 1), (0, 3)})
+        self.assertEqual(board.safe_territory["White"], set())
+
+    def test_one_eye(self):
+        # Black has a single eye and can be captured.
+        board = new_board(parse_diagram("..X../XXX../...../...../....."))
+        self.assertFalse(any(region.is_alive for region in board.regions))
+        self.assertEqual(board.safe_territory, {"Black": set(), "White": set()})
+
+    def test_score_safe_territory(self):
+        # White stones in black's eye have 3 liberties but are proven dead.
+        board = new_board(parse_diagram(".O.O.X.X/XXXXXXXX/........"))
+        board.clear_dead_regions()
+        self.assertEqual(board.captures, Counter({"Black": 0, "White": 2}))
+
+        score = Score("Chinese", komi=False)
+        scores = score.score(board)
+        # 10 stones and 14 points of proven territory.
+        self.assertEqual(scores, Counter({"Black": 24, "White": 0}))
+        self.assertEqual(score.safe_territory, Counter({"Black": 14, "White": 0}))
+
+    def test_large_empty(self):
+        # A single 51 x 51 region must not hit recursion limits.
+        grid = np.full((51, 51), EMPTY, dtype=np.int8)
+        grid[25, 25] = BLACK
+        board = new_board(grid)
+        self.assertEqual(len(board.regions), 2)
+
+        scores = Score("Japanese", komi=False).score(board.clear_dead_regions())
+        self.assertEqual(scores, Counter({"Black": 51 * 51 - 1, "White": 0}))
+
+
+if __name__ == "__main__":
+    unittest.main()
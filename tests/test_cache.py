@@ -0,0 +1,128 @@
+import os
+import pathlib
+import tempfile
+import time
+import unittest
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from GoAT.metrics import Metrics
+from GoAT.vision.cache import Recognition, RecognitionCache
+from GoAT.vision.loader import DetectionParams, load_board, load_board_from_bytes
+
+
+def recognition(size: int) -> Recognition:
+    return Recognition(
+        grid=np.ones((size, size), dtype=np.int8),
+        x_lattice=np.arange(size, dtype=np.float32),
+        y_lattice=np.arange(size, dtype=np.float32),
+    )
+
+
+def put_entries(directory: str, start: int):
+    # Several processes sharing a cache with the same and different keys.
+    cache = RecognitionCache(directory)
+    for i in range(start, start + 10):
+        cache.put(cache.key(bytes([i % 5]), {}), recognition(9))
+    return len(cache)
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = RecognitionCache(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_key(self):
+        key = self.cache.key(b"image", {"blur_size": 9})
+        self.assertEqual(key, self.cache.key(bytearray(b"image"), {"blur_size": 9}))
+        self.assertNotEqual(key, self.cache.key(b"image", {"blur_size": 7}))
+        self.assertNotEqual(key, self.cache.key(b"other", {"blur_size": 9}))
+
+        # Same pixels in a different shape.
+        img = np.zeros((4, 6), dtype=np.uint8)
+        self.assertNotEqual(
+            self.cache.key(img, {}), self.cache.key(img.reshape(6, 4), {})
+        )
+
+    def test_get_put(self):
+        key = self.cache.key(b"image", {})
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.put(key, recognition(9))
+        cached = self.cache.get(key)
+        self.assertEqual(cached.grid.dtype, np.int8)
+        self.assertTrue(np.array_equal(cached.grid, recognition(9).grid))
+        self.assertTrue(np.array_equal(cached.x_lattice, recognition(9).x_lattice))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_get_unreadable(self):
+        key = self.cache.key(b"image", {})
+        self.cache.put(key, recognition(9))
+        path = next(pathlib.Path(self.tmp_dir.name).glob("*/*.npz"))
+        path.write_bytes(b"corrupt")
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(path.exists())
+
+    def test_evict(self):
+        keys = [self.cache.key(bytes([i]), {}) for i in range(10)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, recognition(9))
+            # Order by last use.
+            path = next(pathlib.Path(self.tmp_dir.name).glob(f"*/{key}.npz"))
+            last_use = time.time() - 100 + i
+            os.utime(path, (last_use, last_use))
+        entry_size = self.cache.size() // 10
+
+        # Using oldest entry keeps it.
+        self.cache.get(keys[0])
+        self.cache.max_bytes = entry_size * 5
+        self.cache.put(self.cache.key(b"new", {}), recognition(9))
+
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[-1]))
+
+        n_entries = len(self.cache)
+        self.assertEqual(self.cache.evict(0), n_entries)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_concurrent_put(self):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(put_entries, [self.tmp_dir.name] * 4, range(4)))
+
+        self.assertEqual(len(self.cache), 5)
+        self.assertFalse(list(pathlib.Path(self.tmp_dir.name).glob("*/*.tmp")))
+        for i in range(5):
+            self.assertIsNotNone(self.cache.get(self.cache.key(bytes([i]), {})))
+
+    def test_load_board(self):
+        metrics = Metrics()
+        grid = load_board("docs/images/9_9.png", metrics=metrics, cache=self.cache)
+        self.assertEqual(metrics.counts["cache_misses"], 1)
+
+        # Same bytes from a buffer hit.
+        data = pathlib.Path("docs/images/9_9.png").read_bytes()
+        cached = load_board_from_bytes(data, metrics=metrics, cache=self.cache)
+        self.assertEqual(metrics.counts["cache_hits"], 1)
+        self.assertEqual(metrics.calls["get_pieces"], 1)
+        self.assertTrue(np.array_equal(grid, cached))
+
+        # Different parameters miss.
+        load_board(
+            "docs/images/9_9.png",
+            metrics=metrics,
+            params=DetectionParams(blur_size=7),
+            cache=self.cache,
+        )
+        self.assertEqual(metrics.counts["cache_misses"], 2)
+        self.assertEqual(len(self.cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import bidict
+import numpy as np
+from collections import Counter
+
+from GoAT.logic.board import Board
+from GoAT.logic.encoding import BLACK, COLORS, EMPTY, WHITE, from_float, to_float
+from GoAT.logic.scoring import Score
+
+B, W, E = BLACK, WHITE, EMPTY
+
+
+class TestEncoding(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = np.array([[B, W, E], [B, W, E], [B, W, E]], dtype=np.int8)
+        self.legacy_grid = np.array([[1.0, 0.0, np.nan]] * 3)
+
+    def test_convert(self):
+        encoded = from_float(self.legacy_grid)
+        self.assertEqual(encoded.dtype, np.int8)
+        np.testing.assert_array_equal(encoded, self.grid)
+        np.testing.assert_array_equal(to_float(self.grid), self.legacy_grid)
+
+        with self.assertRaises(Exception):
+            from_float(np.array([[0.5]]))
+
+    def test_legacy_board(self):
+        scores = []
+        for grid, colors in [
+            (self.grid, COLORS),
+            (self.legacy_grid, {"Black": 1.0, "White": 0.0}),
+        ]:
+            board = Board(
+                grid=grid.copy(),
+                captures=Counter({"Black": 0, "White": 0}),
+                colors=bidict.bidict(colors),
+            )
+            np.testing.assert_array_equal(board.grid, self.grid)
+            self.assertEqual(dict(board.colors), COLORS)
+            scores.append(Score("Chinese", komi=False).score(board))
+
+        self.assertEqual(scores[0], scores[1])
+
+        with self.assertRaises(Exception):
+            Board(
+                grid=self.grid.copy(),
+                captures=Counter({"Black": 0, "White": 0}),
+                colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
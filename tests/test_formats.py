@@ -0,0 +1,102 @@
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from collections import Counter
+
+from GoAT.logic.encoding import BLACK, EMPTY, WHITE, empty_grid
+from GoAT.logic.formats import load_grid, parse_diagram, parse_sgf
+
+B, W, E = BLACK, WHITE, EMPTY
+
+
+class TestFormats(unittest.TestCase):
+    def test_parse_diagram(self):
+        expected_grid = np.array([[B, W, E], [E, B, W], [E, E, B]], dtype=np.int8)
+        for diagram in ["XO./.XO/..X", "X O .\n. X O\n. . X\n", "BW+\n+BW\n++B"]:
+            np.testing.assert_array_equal(parse_diagram(diagram), expected_grid)
+
+        with self.assertRaises(Exception):
+            parse_diagram("XO/X")
+        with self.assertRaises(Exception):
+            parse_diagram("XZ/XO")
+
+    def test_parse_sgf(self):
+        # White stone at ba is captured. Variation is ignored.
+        sgf = (
+            "(;GM[1]SZ[5]AB[cc:cd]C[a \\] comment]"
+            ";B[bb];W[ba];B[ca];W[ab];B[aa](;W[ee])(;W[dd]))"
+        )
+        grid, captures = parse_sgf(sgf)
+
+        expected_grid = empty_grid(5, 5)
+        expected_grid[2:4, 2] = BLACK
+        expected_grid[1, 1] = expected_grid[0, 2] = expected_grid[0, 0] = BLACK
+        expected_grid[1, 0] = WHITE
+        expected_grid[4, 4] = WHITE
+
+        np.testing.assert_array_equal(grid, expected_grid)
+        self.assertEqual(captures, Counter({"Black": 0, "White": 1}))
+
+    def test_parse_sgf_unterminated(self):
+        for sgf in ["(;SZ[9]C[abc\\", "(;SZ[9]C[abc"]:
+            with self.assertRaisesRegex(Exception, "Invalid SGF"):
+                parse_sgf(sgf)
+
+    def test_parse_sgf_rectangular(self):
+        # SZ is columns:rows. Coordinates past z continue from A.
+        grid, _ = parse_sgf("(;SZ[30:7]AB[Da]AW[ag])")
+        self.assertEqual(grid.shape, (7, 30))
+        self.assertEqual((grid[0, 29], grid[6, 0]), (BLACK, WHITE))
+
+        with self.assertRaises(Exception):
+            parse_sgf("(;SZ[30:7]AB[ah])")
+
+    def test_load_grid(self):
+        grid = np.array([[B, W], [E, E]], dtype=np.int8)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            npy_path = pathlib.Path(tmp_dir).joinpath("grid.npy")
+            np.save(npy_path, grid)
+            # Legacy float grid where NaN is empty.
+            legacy_npy_path = pathlib.Path(tmp_dir).joinpath("legacy_grid.npy")
+            np.save(legacy_npy_path, np.array([[1.0, 0.0], [np.nan, np.nan]]))
+            txt_path = pathlib.Path(tmp_dir).joinpath("grid.txt")
+            txt_path.write_text("XO\n..\n")
+
+            for path in [npy_path, legacy_npy_path, txt_path]:
+                loaded_grid, captures = load_grid(path)
+                self.assertEqual(loaded_grid.dtype, np.int8)
+                np.testing.assert_array_equal(loaded_grid, grid)
+                self.assertEqual(captures, Counter({"Black": 0, "White": 0}))
+
+            with self.assertRaises(Exception):
+                load_grid(pathlib.Path(tmp_dir).joinpath("grid.csv"))
+
+    def test_grid_formats_no_numpy(self):
+        # main.py checks input suffixes before importing numpy.
+        code = "import sys, GoAT.logic; print('numpy' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+    def test_no_heavy_imports(self):
+        code = (
+            "import sys, bidict;"
+            "from GoAT.logic.encoding import COLORS;"
+            "from GoAT.logic.formats import parse_diagram;"
+            "from GoAT.logic.board import Board;"
+            "from GoAT.logic.scoring import Score;"
+            "from collections import Counter;"
+            "board = Board(grid=parse_diagram('XO./XO./XO.'),"
+            " captures=Counter({'Black': 0, 'White': 0}),"
+            " colors=bidict.bidict(COLORS));"
+            "Score('Chinese').score(board);"
+            "print([mod for mod in ['cv2', 'imutils', 'igraph'] if mod in sys.modules])"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "[]")
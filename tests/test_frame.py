@@ -0,0 +1,93 @@
+import unittest
+import cv2
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from GoAT.metrics import Metrics
+from GoAT.vision.frame import score_frame
+from GoAT.vision.loader import load_board, locate_boards
+
+# Rendered boards and their top-left corner in the frame.
+FRAME_BOARDS = {
+    "5_5": (30, 40),
+    "9_9": (30, 250),
+    "19_19": (20, 500),
+    "seki": (250, 60),
+}
+
+
+def make_frame() -> np.ndarray:
+    frame = np.full((520, 1000, 3), 30, dtype=np.uint8)
+    for name, (y, x) in FRAME_BOARDS.items():
+        img = cv2.imread(f"docs/images/{name}.png")
+        # Pad with wood color so outline of board is visible against background.
+        img = cv2.copyMakeBorder(
+            img,
+            10,
+            10,
+            10,
+            10,
+            cv2.BORDER_CONSTANT,
+            value=[int(v) for v in img[2, 100]],
+        )
+        frame[y : y + img.shape[0], x : x + img.shape[1]] = img
+    return frame
+
+
+class TestFrame(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.frame = make_frame()
+        # Reading order.
+        cls.names = ["5_5", "9_9", "19_19", "seki"]
+
+    def check_results(self, results):
+        self.assertEqual(len(results), len(self.names))
+        for name, result in zip(self.names, results):
+            y, x = FRAME_BOARDS[name]
+            self.assertIsNone(result.error)
+            self.assertAlmostEqual(result.bbox[0], x, delta=5)
+            self.assertAlmostEqual(result.bbox[1], y, delta=5)
+            self.assertTrue(
+                np.array_equal(result.grid, load_board(f"docs/images/{name}.png"))
+            )
+            self.assertEqual(set(result.scores), {"Black", "White"})
+
+    def test_locate_boards(self):
+        boards = locate_boards(self.frame)
+        self.assertEqual(len(boards), len(self.names))
+
+    def test_score_frame_inline(self):
+        self.check_results(score_frame(self.frame, "Chinese", max_workers=1))
+
+    def test_score_frame_pool(self):
+        metrics = Metrics()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.check_results(
+                score_frame(self.frame, "Chinese", executor=executor, metrics=metrics)
+            )
+
+        # Metrics of boards scored in workers are merged.
+        self.assertEqual(metrics.calls["locate_boards"], 1)
+        self.assertEqual(metrics.calls["get_pieces"], len(self.names))
+        self.assertEqual(metrics.calls["score"], len(self.names))
+        self.assertGreater(metrics.counts["contours"], 0)
+
+    def test_score_frame_single_board(self):
+        # No outlines in rendered board so whole image is one board.
+        results = score_frame("docs/images/9_9.png", "Chinese")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].bbox[:2], (0, 0))
+        self.assertTrue(
+            np.array_equal(results[0].grid, load_board("docs/images/9_9.png"))
+        )
+
+    def test_score_frame_matches_scores(self):
+        results = score_frame(self.frame, "Chinese", komi=False, max_workers=1)
+        self.assertEqual(results[0].scores, {"Black": 13.0, "White": 12.0})
+        self.assertEqual(results[3].scores, {"Black": 14.0, "White": 11.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import pathlib
+import unittest
+import cv2
+import numpy as np
+
+from GoAT.logic.encoding import EMPTY
+from GoAT.logic.formats import load_grid
+from GoAT.vision.loader import (
+    ROI_SIZE,
+    DetectionParams,
+    crop_board,
+    decode_image,
+    fit_lattice,
+    locate_board,
+    load_board,
+    load_board_from_array,
+    load_board_from_bytes,
+)
+
+
+def render_grid(rows: int, cols: int) -> np.ndarray:
+    # Random grid with stones on every edge so its extent is visible.
+    rng = np.random.default_rng(1)
+    grid = rng.choice(np.array([0, 1, 2], dtype=np.int8), size=(rows, cols))
+    grid[0, :] = grid[:, 0] = 1
+    grid[-1, :] = grid[:, -1] = 2
+    return grid
+
+
+def render_board(grid: np.ndarray, spacing: int = 30) -> np.ndarray:
+    # Stones don't cover margin so board outline is visible.
+    margin = spacing * 3 // 4
+    rows, cols = grid.shape
+    img = np.full(
+        ((rows - 1) * spacing + 2 * margin, (cols - 1) * spacing + 2 * margin, 3),
+        160,
+        dtype=np.uint8,
+    )
+    for (row, col), val in np.ndenumerate(grid):
+        if val:
+            center = (col * spacing + margin, row * spacing + margin)
+            color = (0, 0, 0) if val == 1 else (255, 255, 255)
+            cv2.circle(img, center, spacing // 2 - 2, color, -1)
+    return img
+
+
+class TestLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.img_9_9 = cv2.imread("docs/images/9_9.png")
+        cls.img_real_19_19 = cv2.imread("docs/images/real_19_19_dark_bg.png")
+        cls.bytes_9_9 = pathlib.Path("docs/images/9_9.png").read_bytes()
+        cls.grid_v_9_9 = load_board("docs/images/9_9.png")
+
+    def test_locate_board_cropped(self):
+        # Rendered board already fills image.
+        self.assertIsNone(locate_board(self.img_9_9))
+
+    def test_locate_board_uncropped(self):
+        corners = locate_board(self.img_real_19_19)
+        self.assertIsNotNone(corners)
+
+        # Top-left and bottom-right corners of board in original image.
+        (tl_x, tl_y), (br_x, br_y) = corners[0], corners[2]
+        self.assertAlmostEqual(tl_x, 16, delta=20)
+        self.assertAlmostEqual(tl_y, 318, delta=20)
+        self.assertAlmostEqual(br_x, 1491, delta=20)
+        self.assertAlmostEqual(br_y, 1782, delta=20)
+
+    def test_crop_board(self):
+        self.assertIs(crop_board(self.img_9_9), self.img_9_9)
+
+        roi = crop_board(self.img_real_19_19)
+        self.assertEqual(roi.shape, (ROI_SIZE, ROI_SIZE, 3))
+
+    def test_load_board_uncropped(self):
+        label, _ = load_grid("docs/labels/real_19_19_dark_bg.txt")
+
+        # Lower black threshold separates touching black stones.
+        grid = load_board(
+            "docs/images/real_19_19_dark_bg.png",
+            params=DetectionParams(black_threshold=60),
+        )
+        np.testing.assert_array_equal(grid, label)
+
+        # Every detected stone is on its labelled intersection.
+        grid = load_board("docs/images/real_19_19_dark_bg.png")
+        detected = grid != EMPTY
+        np.testing.assert_array_equal(grid[detected], label[detected])
+
+    def test_fit_lattice(self):
+        # 9 lines spaced 23 px apart with half spacing margins. Columns 0-2 are empty.
+        lines = 11.5 + 23 * np.arange(9)
+        positions = lines[[3, 4, 4, 6, 8]] + [1, -1, 0, 1, -1]
+        np.testing.assert_allclose(fit_lattice(positions, 9, 207), lines, atol=2)
+
+        with self.assertRaises(Exception):
+            fit_lattice(lines[[0, 8]], 5, 100)
+
+    def test_decode_image(self):
+        img = decode_image(memoryview(self.bytes_9_9))
+        np.testing.assert_array_equal(img, self.img_9_9)
+
+        with self.assertRaises(Exception):
+            decode_image(b"not an image")
+
+    def test_load_board_inputs(self):
+        inputs = [
+            pathlib.Path("docs/images/9_9.png"),
+            self.bytes_9_9,
+            bytearray(self.bytes_9_9),
+            memoryview(self.bytes_9_9),
+            io.BytesIO(self.bytes_9_9),
+            self.img_9_9,
+            cv2.cvtColor(self.img_9_9, cv2.COLOR_BGR2GRAY),
+        ]
+        for src in inputs:
+            with self.subTest(src=type(src)):
+                np.testing.assert_array_equal(load_board(src), self.grid_v_9_9)
+
+        with open("docs/images/9_9.png", "rb") as fh:
+            np.testing.assert_array_equal(load_board_from_bytes(fh), self.grid_v_9_9)
+
+        np.testing.assert_array_equal(
+            load_board_from_array(self.img_9_9), self.grid_v_9_9
+        )
+
+    def test_load_board_rectangular(self):
+        # 7 x 13 board with stones on every edge so its extent is visible.
+        grid = render_grid(7, 13)
+        img = render_board(grid)
+        np.testing.assert_array_equal(
+            load_board(img, localize=False, board_dims=None), grid
+        )
+        # Snapped to square standard size by default.
+        self.assertEqual(load_board(img, localize=False).shape, (13, 13))
+
+        # Boards on a background keep their aspect ratio and enough px per line.
+        for shape in [(7, 13), (15, 25), (25, 25), (41, 41)]:
+            with self.subTest(shape=shape):
+                grid = render_grid(*shape)
+                img = cv2.copyMakeBorder(
+                    render_board(grid),
+                    *[100] * 4,
+                    cv2.BORDER_CONSTANT,
+                    value=(20, 20, 20),
+                )
+                np.testing.assert_array_equal(load_board(img, board_dims=None), grid)
+
+    def test_load_board_no_pieces(self):
+        with self.assertRaises(Exception):
+            load_board("docs/images/19_19_empty.png")
+
+    def test_load_board_missing(self):
+        with self.assertRaises(Exception):
+            load_board("docs/images/missing.png")
@@ -0,0 +1,87 @@
+import json
+import unittest
+import bidict
+from collections import Counter
+
+from GoAT.metrics import Metrics, NULL_METRICS
+from GoAT.logic.board import Board
+from GoAT.logic.encoding import COLORS
+from GoAT.logic.scoring import Score
+from GoAT.vision.loader import load_board
+
+
+class TestMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.metrics = Metrics()
+        grid = load_board("docs/images/9_9.png", metrics=cls.metrics)
+        board = Board(
+            grid=grid,
+            captures=Counter({"Black": 0, "White": 0}),
+            colors=bidict.bidict(COLORS),
+            metrics=cls.metrics,
+        ).clear_dead_regions()
+        cls.scoreboard = Score("Chinese", komi=False)
+        cls.scoreboard.score(board)
+
+    def test_stages(self):
+        expected_stages = {
+            "decode",
+            "crop_board",
+            "get_pieces",
+            "get_board_size",
+            "place_pieces",
+            "_get_regions",
+            "_update_life",
+            "_join_nearby_regions",
+            "_update_graph",
+            "clear_dead_regions",
+            "score",
+        }
+        self.assertEqual(set(self.metrics.timings), expected_stages)
+        # Regions are built on init and after clearing dead regions.
+        self.assertEqual(self.metrics.calls["_get_regions"], 2)
+        self.assertEqual(self.metrics.calls["score"], 1)
+
+    def test_score_metrics(self):
+        # Scoring keeps the scored board's metrics alongside the scores.
+        self.assertIs(self.scoreboard.metrics, self.metrics)
+        self.assertIs(Score("Chinese").metrics, NULL_METRICS)
+
+    def test_counts(self):
+        self.assertEqual(self.metrics.counts["dead_groups"], 2)
+        self.assertEqual(self.metrics.counts["dead_pieces"], 5)
+        self.assertGreater(self.metrics.counts["contours"], 0)
+        self.assertGreater(self.metrics.gauges["regions"], 0)
+
+    def test_formats(self):
+        metrics = json.loads(self.metrics.to_json())
+        self.assertEqual(metrics["counts"]["dead_groups"], 2)
+
+        prometheus = self.metrics.to_prometheus()
+        self.assertIn('goat_stage_seconds_total{stage="get_pieces"}', prometheus)
+        self.assertIn("goat_dead_groups_total 2", prometheus)
+
+    def test_merge(self):
+        metrics = Metrics()
+        with metrics.timer("get_pieces"):
+            metrics.count("contours", 3)
+        metrics.merge(self.metrics)
+
+        self.assertEqual(metrics.calls["get_pieces"], 2)
+        self.assertEqual(
+            metrics.counts["contours"], self.metrics.counts["contours"] + 3
+        )
+        self.assertGreater(
+            metrics.timings["get_pieces"], self.metrics.timings["get_pieces"]
+        )
+        self.assertEqual(metrics.gauges, self.metrics.gauges)
+
+    def test_disabled(self):
+        with NULL_METRICS.timer("stage"):
+            NULL_METRICS.count("count")
+        NULL_METRICS.gauge("gauge", 1)
+        self.assertEqual(
+            NULL_METRICS.to_dict(),
+            {"timings": {}, "calls": {}, "counts": {}, "gauges": {}},
+        )
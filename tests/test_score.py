@@ -3,6 +3,7 @@ import bidict
 from collections import Counter
 
 from GoAT.logic.board import Board
+from GoAT.logic.encoding import COLORS
 from GoAT.logic.scoring import Score
 from GoAT.vision.loader import load_board
 
@@ -25,7 +26,7 @@ class TestScore(unittest.TestCase):
         board_v_5_5 = Board(
             grid=self.grid_v_5_5.copy(),
             captures=Counter({"Black": 0, "White": 0}),
-            colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
+            colors=bidict.bidict(COLORS),
         ).clear_dead_regions()
 
         # Score board and declare score.
@@ -37,7 +38,7 @@ class TestScore(unittest.TestCase):
         board_v_9_9 = Board(
             grid=self.grid_v_9_9.copy(),
             captures=Counter({"Black": 0, "White": 0}),
-            colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
+            colors=bidict.bidict(COLORS),
         ).clear_dead_regions()
 
         # Score board and declare score.
@@ -50,7 +51,7 @@ class TestScore(unittest.TestCase):
         board_v_5_5 = Board(
             grid=self.grid_v_5_5.copy(),
             captures=captured_pieces,
-            colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
+            colors=bidict.bidict(COLORS),
         ).clear_dead_regions()
 
         # Score board and declare score.
@@ -63,7 +64,7 @@ class TestScore(unittest.TestCase):
         board_v_9_9 = Board(
             grid=self.grid_v_9_9.copy(),
             captures=captured_pieces,
-            colors=bidict.bidict({"Black": 1.0, "White": 0.0}),
+            colors=bidict.bidict(COLORS),
         ).clear_dead_regions()
 
         # Score board and declare score.
@@ -0,0 +1,126 @@
+import asyncio
+import http.client
+import json
+import os
+import pathlib
+import unittest
+
+from GoAT.service.server import ScoringService
+
+
+def request(port: int, method: str, path: str, body: bytes = b""):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request(method, path, body=body)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+class TestService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.service = await ScoringService(
+            port=0, max_workers=1, batch_window=0.05
+        ).start()
+
+    async def asyncTearDown(self) -> None:
+        await self.service.stop()
+
+    async def _request(self, method: str, path: str, body: bytes = b""):
+        return await asyncio.to_thread(request, self.service.port, method, path, body)
+
+    async def test_score_image(self):
+        img = pathlib.Path("docs/images/5_5.png").read_bytes()
+        status, payload = await self._request(
+            "POST", "/score/image?scoring=Chinese&komi=false", img
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["scores"], {"Black": 13, "White": 12})
+        self.assertEqual(len(payload["grid"]), 5)
+
+    async def test_score_grids_batched(self):
+        grid = [[None, 1, 0, None, None] for _ in range(5)]
+        body = json.dumps({"grid": grid, "scoring": "Chinese"}).encode()
+        results = await asyncio.gather(
+            *[self._request("POST", "/score/grid", body) for _ in range(4)]
+        )
+        for status, payload in results:
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["scores"], {"Black": 10, "White": 15})
+
+        self.assertLess(self.service.n_batches, 4)
+        self.assertEqual(self.service.n_batched_grids, 4)
+
+    async def test_errors(self):
+        status, _ = await self._request("GET", "/missing")
+        self.assertEqual(status, 404)
+
+        status, _ = await self._request("GET", "/score/grid")
+        self.assertEqual(status, 405)
+
+        body = json.dumps({"grid": [[[1, 0]]], "scoring": "Chinese"}).encode()
+        status, payload = await self._request("POST", "/score/grid", body)
+        self.assertEqual(status, 400)
+        self.assertIn("Invalid grid shape", payload["error"])
+
+        body = json.dumps({"grid": [[1.0]], "scoring": "Korean"}).encode()
+        status, payload = await self._request("POST", "/score/grid", body)
+        self.assertEqual(status, 400)
+
+    async def test_backpressure(self):
+        self.service.pending = self.service.max_pending
+        body = json.dumps({"grid": [[1.0]], "scoring": "Chinese"}).encode()
+        status, _ = await self._request("POST", "/score/grid", body)
+        self.assertEqual(status, 503)
+        self.service.pending = 0
+
+    async def test_metrics(self):
+        await self._request("GET", "/health")
+        status, payload = await self._request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["requests"]["/health"]["count"], 1)
+        self.assertIn("p99_ms", payload["requests"]["/health"])
+        self.assertEqual(payload["queue_depth"], 0)
+
+    async def test_read_timeout(self):
+        self.service.read_timeout = 0.2
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.service.port)
+        # Send nothing.
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        self.assertTrue(response.startswith(b"HTTP/1.1 408"))
+
+    async def test_stop_idle_connection(self):
+        service = await ScoringService(port=0, max_workers=1).start()
+        _, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        await asyncio.sleep(0.05)
+        # Client that never sends a request doesn't block shutdown.
+        await asyncio.wait_for(service.stop(), 5)
+        writer.close()
+
+    async def test_broken_pool(self):
+        # Worker exiting breaks the pool. Only running requests fail.
+        with self.assertRaises(Exception):
+            await self.service._run_in_pool(os._exit, 1)
+        self.assertEqual(self.service.n_pool_restarts, 1)
+
+        img = pathlib.Path("docs/images/5_5.png").read_bytes()
+        status, _ = await self._request("POST", "/score/image?scoring=Chinese", img)
+        self.assertEqual(status, 200)
+
+        body = json.dumps({"grid": [[1.0]], "scoring": "Chinese"}).encode()
+        status, _ = await self._request("POST", "/score/grid", body)
+        self.assertEqual(status, 200)
+
+    async def test_health_broken_pool(self):
+        # Worker dies outside of a request.
+        future = self.service._pool.submit(os._exit, 1)
+        with self.assertRaises(Exception):
+            await asyncio.wrap_future(future)
+
+        status, _ = await self._request("GET", "/health")
+        self.assertEqual(status, 503)
+        status, payload = await self._request("GET", "/health")
+        self.assertEqual((status, payload), (200, {"status": "ok"}))
+        self.assertEqual(self.service.n_pool_restarts, 1)
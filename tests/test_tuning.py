@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+import numpy as np
+
+from GoAT.logic.formats import load_grid
+from GoAT.vision.loader import (
+    DEFAULT_PARAMS,
+    DetectionParams,
+    load_board,
+    load_profile,
+    save_profile,
+)
+from GoAT.vision.tuning import (
+    best_trial,
+    find_label,
+    param_sets,
+    prepare_image,
+    sweep,
+)
+
+
+class TestTuning(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.images = [
+            prepare_image(img_path, load_grid(find_label(img_path, "docs/labels"))[0])
+            for img_path in ["docs/images/5_5.png", "docs/images/9_9.png"]
+        ]
+        # Both recognize rendered boards.
+        cls.params = [DEFAULT_PARAMS, DetectionParams(blur_size=5, cluster_gap=3)]
+        # Blur merges pieces.
+        cls.bad_params = DetectionParams(blur_size=51)
+
+    def test_invalid_params(self):
+        with self.assertRaises(Exception):
+            DetectionParams(blur_size=8)
+        with self.assertRaises(Exception):
+            DetectionParams(black_threshold=200, white_threshold=100)
+
+    def test_param_sets(self):
+        sets = param_sets(
+            {"black_threshold": [100, 150, 250], "white_threshold": [200]}
+        )
+        # Black threshold above white threshold is skipped.
+        self.assertEqual([params.black_threshold for params in sets], [100, 150])
+        self.assertIn(DEFAULT_PARAMS, param_sets())
+
+    def test_find_label(self):
+        self.assertEqual(
+            find_label("docs/images/9_9.png", "docs/labels").name, "9_9.txt"
+        )
+        with self.assertRaises(Exception):
+            find_label("docs/images/9_9.png")
+
+    def test_sweep(self):
+        params = [*self.params, self.bad_params]
+        trials = sweep(self.images, params, max_workers=1)
+        self.assertEqual([trial.params for trial in trials], params)
+        self.assertEqual([trial.n_correct for trial in trials[:2]], [2, 2])
+        self.assertLess(trials[2].n_correct, 2)
+        self.assertGreater(trials[2].n_wrong, 0)
+
+        # Same results in a pool.
+        pool_trials = sweep(self.images, params, max_workers=2)
+        self.assertEqual(
+            [(trial.n_correct, trial.n_wrong) for trial in pool_trials],
+            [(trial.n_correct, trial.n_wrong) for trial in trials],
+        )
+
+        best = best_trial(self.images, trials, repeat=1)
+        self.assertIn(best.params, self.params)
+        self.assertIsNone(best_trial(self.images, trials[2:]))
+
+        # Closest parameter set if none are exact.
+        closest = best_trial(self.images, trials[2:], repeat=1, exact=False)
+        self.assertEqual(closest.params, self.bad_params)
+        self.assertEqual(closest.n_wrong, trials[2].n_wrong)
+
+    def test_profile(self):
+        params = DetectionParams(blur_size=5, cluster_gap=3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = save_profile("test", params, tmp_dir, images=["9_9.png"])
+            self.assertEqual(load_profile("test", tmp_dir), params)
+
+            # Loaded by path at runtime.
+            grid = load_board("docs/images/9_9.png", params=str(path))
+            self.assertTrue(np.array_equal(grid, self.images[1][1]))
+
+        with self.assertRaises(Exception):
+            load_profile("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()